@@ -1,12 +1,20 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 import csv
 import time
+import itertools
 import os
+from pathlib import Path
 from datetime import datetime, timedelta
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
+from dataclasses import dataclass
+from typing import Optional
 import re
 import signal
 import sys
@@ -14,38 +22,95 @@ import traceback
 import argparse
 import json
 import hashlib
-
-# Add this near the top of your file, after imports:
-import platform
-
-# Modify the initialize_driver function to handle Docker better:
-def initialize_driver(headless=True):
+import random
+from array import array
+
+# orjson parses the execute_script payloads several times faster; fall back to
+# the standard library when it is not installed
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+@dataclass(frozen=True)
+class RuntimeCfg:
     """
-    Initialize Chrome driver optimized for headless operation
+    Process settings read from the environment once, at import time
     """
-    chrome_options = Options()
-    
-    # Essential options for headless operation
-    if headless:
-        chrome_options.add_argument("--headless=new")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    
-    # Additional Docker-specific optimizations
-    if os.environ.get('DOCKER_MODE') == 'true':
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--remote-debugging-port=9222")
-        chrome_options.add_argument("--remote-debugging-address=0.0.0.0")
-    
-    # [Rest of the function remains the same...]
-#fix this to only use the yml file directory path for better scalability!!
-# Use Docker-specific paths
-if os.environ.get('DOCKER_MODE') == 'true':
-    DEFAULT_OUTPUT_DIR = "/home/scraper/data"
+    docker: bool
+    output_dir: str
+    headless: bool
+    # Optional WebDriver endpoint (e.g. the chromedriver service in docker-compose.yml).
+    # When set, each run opens (and quits) its own session on that long-lived browser
+    # container instead of starting a local Chrome.
+    remote_webdriver_url: Optional[str]
+
+def load_runtime_cfg():
+    """
+    Build the RuntimeCfg from DOCKER_MODE, OUTPUT_DIR, HEADLESS and REMOTE_WEBDRIVER_URL
+    """
+    docker = os.environ.get('DOCKER_MODE') == 'true'
+    # Use Docker-specific paths unless OUTPUT_DIR overrides them
+    default_output_dir = "/home/scraper/data" if docker else os.path.join(os.getcwd(), "data")
+    return RuntimeCfg(
+        docker=docker,
+        output_dir=os.environ.get('OUTPUT_DIR', default_output_dir),
+        headless=os.environ.get('HEADLESS', 'true').lower() != 'false',
+        remote_webdriver_url=os.environ.get('REMOTE_WEBDRIVER_URL') or None
+    )
+
+RUNTIME = load_runtime_cfg()
 
 current_output_file = None
 current_settings_hash = None
 
+# Precompiled patterns used on the per-row and filename paths
+DATE_IN_EVENT_RE = re.compile(r'(\d{1,2}\s+[A-Za-z]+\s+\d{4})')
+YEAR_SUFFIX_RE = re.compile(r'\d{4}$')
+ROW_KIND_RE = re.compile(r'ec-table__item_(holiday|meeting)')
+ILLEGAL_FILENAME_CHARS_RE = re.compile(r'[\\/*?:"<>|]')
+
+CSV_WRITE_BUFFER = 1 << 20
+# Rows written between CSV flushes that commit their ids to the .idx sidecar
+INDEX_COMMIT_ROWS = 1000
+# The .idx starts with the byte size of the CSV it covers, followed by 8-byte event ids
+INDEX_HEADER_SIZE = 8
+
+# Resources the scraper never reads. Stylesheets are deliberately not blocked:
+# the row dump uses innerText, which depends on the page's CSS layout.
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.webp", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.mp4", "*.webm", "*.mp3",
+    "*analytics*", "*gtag*", "*googletagmanager*", "*doubleclick*"
+]
+
+# One is picked per browser session. Chrome-only, so the UA matches the engine
+# the site actually talks to.
+USER_AGENTS = [
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36"
+]
+
+CSV_FIELDNAMES = ["Date", "Time", "Currency", "Event", "Impact", "Actual", "Forecast", "Previous", "IsHoliday", "WeekRange"]
+
 # ------------------------------
 # Mapping: currency codes -> exact labels (as shown in the UI)
 # ------------------------------
@@ -77,6 +142,133 @@ IMPORTANCE_LABELS = {
     "Holidays": "Holidays"
 }
 
+# Case-insensitive lookups for user-supplied filter names
+_CURRENCY_FOLD = {c.casefold(): c for c in CURRENCY_LABELS}
+_IMPORTANCE_FOLD = {k.casefold(): k for k in IMPORTANCE_LABELS}
+
+# ------------------------------
+# Mapping: filter labels -> checkbox element ids
+# ------------------------------
+IMPORTANCE_CHECKBOX_IDS = {
+    "Holidays": "filterImportance1",
+    "Low": "filterImportance2",
+    "Medium": "filterImportance4",
+    "High": "filterImportance8"
+}
+
+CURRENCY_CHECKBOX_IDS = {
+    "AUD": "filterCurrency32",
+    "BRL": "filterCurrency1024",
+    "CAD": "filterCurrency16",
+    "CHF": "filterCurrency64",
+    "CNY": "filterCurrency128",
+    "EUR": "filterCurrency2",
+    "GBP": "filterCurrency8",
+    "HKD": "filterCurrency4096",
+    "INR": "filterCurrency65536",
+    "JPY": "filterCurrency4",
+    "KRW": "filterCurrency2048",
+    "MXN": "filterCurrency16384",
+    "NOK": "filterCurrency131072",
+    "NZD": "filterCurrency256",
+    "SEK": "filterCurrency512",
+    "SGD": "filterCurrency8192",
+    "USD": "filterCurrency1",
+    "ZAR": "filterCurrency32768"
+}
+
+# ------------------------------
+# Locators, built once and reused by every lookup
+# ------------------------------
+CALENDAR_TABLE = (By.CSS_SELECTOR, "div#economicCalendarTable")
+CALENDAR_BODY = (By.CSS_SELECTOR, "div.ec-table__body#economicCalendarTable")
+CALENDAR_ITEM = (By.CSS_SELECTOR, "div.ec-table__item")
+CALENDAR_ROW = (By.CSS_SELECTOR, "div.ec-table__body#economicCalendarTable div.ec-table__item, div.ec-table__body#economicCalendarTable div.ec-table__title")
+CURRENT_WEEK_NAV = (By.XPATH, "//div[@id='economicCalendarTable']//div[contains(@class, 'ec-table__nav__item_current')]")
+
+CURRENT_WEEK_LABEL = (By.XPATH, "//label[@for='filterDate1' and contains(., 'Current week')]")
+CURRENT_WEEK_ITEM = (By.XPATH, "//label[@for='filterDate1']/..")
+CURRENT_WEEK_RADIO = (By.XPATH, "//input[@id='filterDate1']")
+PREVIOUS_MONTH_LABEL = (By.XPATH, "//label[@for='filterDate5' and contains(., 'Previous month')]")
+PREVIOUS_MONTH_ITEM = (By.XPATH, "//label[@for='filterDate5']/..")
+PREVIOUS_MONTH_RADIO = (By.XPATH, "//input[@id='filterDate5']")
+
+SELECT_ALL_CURRENCIES_ID = "selectAllCurrencies"
+
+# Wait conditions over the fixed locators above; they hold no state, so build them once
+CALENDAR_TABLE_PRESENT = EC.presence_of_element_located(CALENDAR_TABLE)
+CALENDAR_BODY_PRESENT = EC.presence_of_element_located(CALENDAR_BODY)
+CALENDAR_ITEM_PRESENT = EC.presence_of_element_located(CALENDAR_ITEM)
+CALENDAR_ROW_PRESENT = EC.presence_of_element_located(CALENDAR_ROW)
+CURRENT_WEEK_NAV_PRESENT = EC.presence_of_element_located(CURRENT_WEEK_NAV)
+CURRENT_WEEK_LABEL_CLICKABLE = EC.element_to_be_clickable(CURRENT_WEEK_LABEL)
+CURRENT_WEEK_RADIO_CLICKABLE = EC.element_to_be_clickable(CURRENT_WEEK_RADIO)
+PREVIOUS_MONTH_LABEL_CLICKABLE = EC.element_to_be_clickable(PREVIOUS_MONTH_LABEL)
+PREVIOUS_MONTH_RADIO_CLICKABLE = EC.element_to_be_clickable(PREVIOUS_MONTH_RADIO)
+
+# ------------------------------
+# Browser-side checkbox helpers. Each runs as one execute_script call so a
+# filter pass costs a single round-trip instead of several per checkbox.
+# ------------------------------
+CLEAR_FILTERS_JS = """
+let cleared = 0;
+document.querySelectorAll(
+    '#economicCalendarFilterImportance input[type=checkbox], #economicCalendarFilterCurrency input[type=checkbox]'
+).forEach(cb => {
+    // Re-read the state: unchecking "Select all" may already have cleared the rest
+    if (cb.checked) { cb.click(); cleared++; }
+});
+return cleared;
+"""
+
+CHECKBOX_STATES_JS = """
+return Array.from(document.querySelectorAll(
+    '#economicCalendarFilterCurrency input[type=checkbox], #economicCalendarFilterImportance input[type=checkbox]'
+)).map(cb => [cb.id, cb.checked]);
+"""
+
+TOGGLE_CHECKBOXES_JS = """
+arguments[0].forEach(id => {
+    const cb = document.getElementById(id);
+    if (cb) { cb.click(); }
+});
+"""
+
+# ------------------------------
+# Browser-side extraction of the calendar table. Runs in a single
+# execute_script call and returns a JSON array with one plain object per
+# child div; missing cells come back as null so the Python side can keep
+# its "nan" / "All Day" defaults.
+# ------------------------------
+COLLECT_ROWS_JS = """
+const text = (el, selector) => {
+    const node = el.querySelector(selector);
+    return node ? node.innerText.trim() : null;
+};
+const rows = [];
+document.querySelectorAll('div.ec-table__body#economicCalendarTable > div').forEach(el => {
+    const classes = el.className || '';
+    const row = {classes: classes};
+    if (classes.includes('ec-table__title')) {
+        row.text = el.innerText.trim();
+    } else if (classes.includes('ec-table__nav')) {
+        row.text = text(el, '.ec-table__nav__item_current');
+    } else if (classes.includes('ec-table__item')) {
+        const impact = el.querySelector('span.ec-table__importance');
+        row.time = text(el, 'div.ec-table__col_time div');
+        row.currency = text(el, 'div.ec-table__col_currency div.ec-table__curency-name');
+        row.eventText = text(el, 'div.ec-table__col_event');
+        row.eventLink = text(el, 'div.ec-table__col_event a');
+        row.impactClass = impact ? (impact.className || '') : null;
+        row.actual = text(el, 'div.ec-table__col_actual span');
+        row.forecast = text(el, 'div.ec-table__col_forecast');
+        row.previous = text(el, 'div.ec-table__col_previous div');
+    }
+    rows.push(row);
+});
+return JSON.stringify(rows);
+"""
+
 # Global variables
 driver = None
 wait = None
@@ -86,7 +278,11 @@ first_week_collected = None
 last_week_collected = None
 settings_hash = None
 resuming_from_state = False
+output_handle = None
+index_handle = None
+_seen_event_ids = set()
 
+@lru_cache(maxsize=1)
 def get_previous_month_name():
     """Get the name of the previous month in 'Month Year' format"""
     today = datetime.now()
@@ -99,13 +295,19 @@ def signal_handler(sig, frame):
     print('\nShutdown signal received! Saving collected data...')
     shutdown_flag = True
     graceful_exit = True
+    # Push whatever is sitting in the write buffers to disk
+    for handle in (output_handle, index_handle):
+        if handle is not None:
+            try:
+                handle.flush()
+            except (RuntimeError, ValueError):
+                # Interrupted mid-write or already closed; the with-block flushes on exit
+                pass
 
 def get_current_week_range():
     try:
         current_week_element = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located(
-                (By.XPATH, "//div[@id='economicCalendarTable']//div[contains(@class, 'ec-table__nav__item_current')]")
-            )
+            CURRENT_WEEK_NAV_PRESENT
         )
         return current_week_element.text.strip()
     except Exception as e:
@@ -115,16 +317,16 @@ def get_current_week_range():
 def set_to_current_week():
     """Click the 'Current week' button to set the calendar to the current week"""
     try:
-        current_week_label_xpath = "//label[@for='filterDate1' and contains(., 'Current week')]"
         current_week_label = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, current_week_label_xpath))
+            CURRENT_WEEK_LABEL_CLICKABLE
         )
         
-        parent_li = driver.find_element(By.XPATH, "//label[@for='filterDate1']/..")
+        parent_li = driver.find_element(*CURRENT_WEEK_ITEM)
         if "active" not in parent_li.get_attribute("class"):
             print("Clicking 'Current week' label...")
+            old_row = find_calendar_row()
             safe_click(current_week_label)
-            time.sleep(3)
+            wait_for_table_refresh(old_row)
         else:
             print("Calendar is already set to current week.")
             
@@ -132,14 +334,14 @@ def set_to_current_week():
     except Exception as e:
         print(f"Error setting to current week: {e}")
         try:
-            current_week_selector = "//input[@id='filterDate1']"
             current_week_radio = WebDriverWait(driver, 5).until(
-                EC.element_to_be_clickable((By.XPATH, current_week_selector))
+                CURRENT_WEEK_RADIO_CLICKABLE
             )
             if not current_week_radio.is_selected():
                 print("Fallback: Clicking 'Current week' radio button...")
+                old_row = find_calendar_row()
                 safe_click(current_week_radio)
-                time.sleep(3)
+                wait_for_table_refresh(old_row)
             return True
         except Exception as e2:
             print(f"Fallback also failed: {e2}")
@@ -148,18 +350,16 @@ def set_to_current_week():
 def set_to_previous_month():
     """Click the 'Previous month' button to set the calendar to the previous month"""
     try:
-        time.sleep(2)
-        
-        previous_month_label_xpath = "//label[@for='filterDate5' and contains(., 'Previous month')]"
         previous_month_label = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, previous_month_label_xpath))
+            PREVIOUS_MONTH_LABEL_CLICKABLE
         )
         
-        parent_li = driver.find_element(By.XPATH, "//label[@for='filterDate5']/..")
+        parent_li = driver.find_element(*PREVIOUS_MONTH_ITEM)
         if "active" not in parent_li.get_attribute("class"):
             print("Clicking 'Previous month' label...")
+            old_row = find_calendar_row()
             safe_click(previous_month_label)
-            time.sleep(3)
+            wait_for_table_refresh(old_row)
         else:
             print("Calendar is already set to previous month.")
             
@@ -167,14 +367,14 @@ def set_to_previous_month():
     except Exception as e:
         print(f"Error setting to previous month: {e}")
         try:
-            previous_month_selector = "//input[@id='filterDate5']"
             previous_month_radio = WebDriverWait(driver, 5).until(
-                EC.element_to_be_clickable((By.XPATH, previous_month_selector))
+                PREVIOUS_MONTH_RADIO_CLICKABLE
             )
             if not previous_month_radio.is_selected():
                 print("Fallback: Clicking 'Previous month' radio button...")
+                old_row = find_calendar_row()
                 safe_click(previous_month_radio)
-                time.sleep(3)
+                wait_for_table_refresh(old_row)
             return True
         except Exception as e2:
             print(f"Fallback also failed: {e2}")
@@ -194,32 +394,70 @@ def safe_click(element):
             print(f"safe_click failed: {e}")
             return False
 
+def find_calendar_row():
+    """Return the first rendered calendar row, or None if the table is empty."""
+    rows = driver.find_elements(*CALENDAR_ROW)
+    return rows[0] if rows else None
+
+def wait_for_table_refresh(old_row, timeout=10):
+    """
+    Wait until the calendar table has been re-rendered after a date or filter change.
+    old_row: row captured with find_calendar_row() before the change was made
+    """
+    try:
+        if old_row is not None:
+            WebDriverWait(driver, timeout).until(EC.staleness_of(old_row))
+        WebDriverWait(driver, timeout).until(CALENDAR_ROW_PRESENT)
+        return True
+    except TimeoutException:
+        print("Timed out waiting for the calendar to refresh - continuing anyway")
+        return False
+
+def wait_for_row_count_stable(timeout=10, interval=0.25):
+    """
+    Poll the number of calendar items until two consecutive reads agree.
+    Returns the settled count, or the last count seen when timeout expires.
+    """
+    deadline = time.monotonic() + timeout
+    last_count = len(driver.find_elements(*CALENDAR_ITEM))
+    while time.monotonic() < deadline:
+        time.sleep(interval)
+        count = len(driver.find_elements(*CALENDAR_ITEM))
+        if count == last_count:
+            return count
+        last_count = count
+    print("Row count still changing after timeout - continuing anyway")
+    return last_count
+
+def get_checkbox_states():
+    """
+    Return {checkbox_id: checked} for every importance and currency filter checkbox.
+    """
+    return dict(driver.execute_script(CHECKBOX_STATES_JS))
+
+def toggle_checkboxes(checkbox_ids):
+    """
+    Click the given checkboxes, in order, with a single execute_script call.
+    """
+    if checkbox_ids:
+        driver.execute_script(TOGGLE_CHECKBOXES_JS, list(checkbox_ids))
+
 def clear_all_filters():
     """
     Clear all existing filters by unchecking all checkboxes in the importance and currency sections.
     """
     try:
         print("Clearing all existing filters...")
+        old_row = find_calendar_row()
         
-        # Uncheck all importance checkboxes
-        importance_container = driver.find_element(By.ID, "economicCalendarFilterImportance")
-        importance_checkboxes = importance_container.find_elements(By.XPATH, ".//input[@type='checkbox']")
-        
-        for checkbox in importance_checkboxes:
-            if checkbox.is_selected() or checkbox.get_attribute("checked"):
-                safe_click(checkbox)
-                time.sleep(0.2)
+        # Uncheck all importance and currency checkboxes (including "Select all") in one DOM pass
+        cleared = driver.execute_script(CLEAR_FILTERS_JS)
         
-        # Uncheck all currency checkboxes (including "Select all")
-        currency_container = driver.find_element(By.ID, "economicCalendarFilterCurrency")
-        currency_checkboxes = currency_container.find_elements(By.XPATH, ".//input[@type='checkbox']")
+        # Let the clear's own re-render finish, so the next filter step doesn't mistake it for its own
+        if cleared:
+            wait_for_table_refresh(old_row)
         
-        for checkbox in currency_checkboxes:
-            if checkbox.is_selected() or checkbox.get_attribute("checked"):
-                safe_click(checkbox)
-                time.sleep(0.2)
-        
-        print("All filters cleared successfully")
+        print(f"All filters cleared successfully ({cleared} checkboxes unchecked)")
         return True
         
     except Exception as e:
@@ -233,38 +471,36 @@ def apply_importance_filters(selected_importance):
     """
     print("Applying importance filters...")
     
-    importance_mapping = {
-        "Holidays": "filterImportance1",
-        "Low": "filterImportance2",
-        "Medium": "filterImportance4",
-        "High": "filterImportance8"
-    }
-    
     try:
+        old_row = find_calendar_row()
+        states = get_checkbox_states()
+
         if "ALL" in [imp.upper() for imp in selected_importance]:
             print("  Selecting ALL importance levels")
-            for importance, checkbox_id in importance_mapping.items():
-                checkbox = driver.find_element(By.ID, checkbox_id)
-                if not (checkbox.is_selected() or checkbox.get_attribute("checked")):
-                    safe_click(checkbox)
-                    print(f"    Selected: {importance}")
-                time.sleep(0.2)
+            targets = list(IMPORTANCE_CHECKBOX_IDS)
         else:
+            targets = []
             for importance in selected_importance:
-                if importance in importance_mapping:
-                    checkbox_id = importance_mapping[importance]
-                    checkbox = driver.find_element(By.ID, checkbox_id)
-                    
-                    if not (checkbox.is_selected() or checkbox.get_attribute("checked")):
-                        safe_click(checkbox)
-                        print(f"  Selected importance: {importance}")
-                    else:
-                        print(f"  Importance '{importance}' was already selected")
+                if importance in IMPORTANCE_CHECKBOX_IDS:
+                    targets.append(importance)
                 else:
                     print(f"  Warning: Unknown importance level '{importance}'")
+
+        to_click = []
+        for importance in targets:
+            checkbox_id = IMPORTANCE_CHECKBOX_IDS[importance]
+            if checkbox_id not in states:
+                print(f"  Could not find checkbox for importance '{importance}'")
+            elif states[checkbox_id]:
+                print(f"  Importance '{importance}' was already selected")
+            else:
+                to_click.append(checkbox_id)
+                print(f"  Selected importance: {importance}")
+        toggle_checkboxes(to_click)
         
-        print("Waiting 5 seconds for importance filters to apply...")
-        time.sleep(5)
+        if to_click:
+            print("Waiting for importance filters to apply...")
+            wait_for_table_refresh(old_row)
         return True
         
     except Exception as e:
@@ -278,75 +514,70 @@ def apply_currency_filters(selected_currencies):
     """
     print("Applying currency filters...")
     
-    currency_mapping = {
-        "AUD": "filterCurrency32",
-        "BRL": "filterCurrency1024",
-        "CAD": "filterCurrency16",
-        "CHF": "filterCurrency64",
-        "CNY": "filterCurrency128",
-        "EUR": "filterCurrency2",
-        "GBP": "filterCurrency8",
-        "HKD": "filterCurrency4096",
-        "INR": "filterCurrency65536",
-        "JPY": "filterCurrency4",
-        "KRW": "filterCurrency2048",
-        "MXN": "filterCurrency16384",
-        "NOK": "filterCurrency131072",
-        "NZD": "filterCurrency256",
-        "SEK": "filterCurrency512",
-        "SGD": "filterCurrency8192",
-        "USD": "filterCurrency1",
-        "ZAR": "filterCurrency32768"
-    }
-    
     try:
-        if "ALL" in [curr.upper() for curr in selected_currencies]:
+        old_row = find_calendar_row()
+        states = get_checkbox_states()
+        selected_upper = [curr.upper() for curr in selected_currencies]
+        changed = False
+
+        if "ALL" in selected_upper:
             print("  Selecting ALL currencies using 'Select all' checkbox")
-            select_all_checkbox = driver.find_element(By.ID, "selectAllCurrencies")
-            if not (select_all_checkbox.is_selected() or select_all_checkbox.get_attribute("checked")):
-                safe_click(select_all_checkbox)
-                print("    Selected: ALL currencies")
-            else:
+            if SELECT_ALL_CURRENCIES_ID not in states:
+                print("    Could not find 'Select all' checkbox")
+            elif states[SELECT_ALL_CURRENCIES_ID]:
                 print("    'Select all' was already selected")
+            else:
+                toggle_checkboxes([SELECT_ALL_CURRENCIES_ID])
+                changed = True
+                print("    Selected: ALL currencies")
         else:
-            try:
-                select_all_checkbox = driver.find_element(By.ID, "selectAllCurrencies")
-                if select_all_checkbox.is_selected() or select_all_checkbox.get_attribute("checked"):
-                    safe_click(select_all_checkbox)
-                    print("  Unchecked 'Select all'")
-                    time.sleep(1)
-            except Exception as e:
-                print(f"  Could not find or interact with 'Select all' checkbox: {e}")
-            
-            for currency in selected_currencies:
-                if currency.upper() in currency_mapping:
-                    checkbox_id = currency_mapping[currency.upper()]
-                    try:
-                        checkbox = driver.find_element(By.ID, checkbox_id)
-                        
-                        is_selected = checkbox.is_selected() or checkbox.get_attribute("checked")
-                        if not is_selected:
-                            safe_click(checkbox)
-                            print(f"  Selected currency: {currency}")
-                        else:
-                            print(f"  Currency '{currency}' was already selected")
-                    except Exception as e:
-                        print(f"  Could not find checkbox for {currency}: {e}")
-                else:
+            if SELECT_ALL_CURRENCIES_ID not in states:
+                print("  Could not find 'Select all' checkbox")
+            elif states[SELECT_ALL_CURRENCIES_ID]:
+                toggle_checkboxes([SELECT_ALL_CURRENCIES_ID])
+                changed = True
+                print("  Unchecked 'Select all'")
+                # Unchecking "Select all" cascades to the individual boxes; poll until
+                # none of them is still checked instead of sleeping a fixed second
+                currency_ids = set(CURRENCY_CHECKBOX_IDS.values())
+
+                def cascaded(d):
+                    current = dict(d.execute_script(CHECKBOX_STATES_JS))
+                    if any(current.get(cb_id) for cb_id in currency_ids):
+                        return False
+                    return current
+
+                try:
+                    states = WebDriverWait(driver, 5, poll_frequency=0.1).until(cascaded)
+                except TimeoutException:
+                    print("  Currency boxes still checked after unchecking 'Select all' - continuing")
+                    states = get_checkbox_states()
+
+            to_click = []
+            for currency in selected_upper:
+                if currency not in CURRENCY_CHECKBOX_IDS:
                     print(f"  Warning: Unknown currency code '{currency}'")
+                    continue
+                checkbox_id = CURRENCY_CHECKBOX_IDS[currency]
+                if checkbox_id not in states:
+                    print(f"  Could not find checkbox for {currency}")
+                elif states[checkbox_id]:
+                    print(f"  Currency '{currency}' was already selected")
+                elif checkbox_id not in to_click:
+                    to_click.append(checkbox_id)
+                    print(f"  Selected currency: {currency}")
             
-            if "ZAR" not in [curr.upper() for curr in selected_currencies]:
-                zar_checkbox_id = currency_mapping["ZAR"]
-                try:
-                    zar_checkbox = driver.find_element(By.ID, zar_checkbox_id)
-                    if zar_checkbox.is_selected() or zar_checkbox.get_attribute("checked"):
-                        safe_click(zar_checkbox)
-                        print("  Explicitly unchecked ZAR as it was not selected")
-                except Exception as e:
-                    print(f"  Could not find ZAR checkbox to uncheck: {e}")
+            zar_checkbox_id = CURRENCY_CHECKBOX_IDS["ZAR"]
+            if "ZAR" not in selected_upper and states.get(zar_checkbox_id):
+                to_click.append(zar_checkbox_id)
+                print("  Explicitly unchecked ZAR as it was not selected")
+
+            toggle_checkboxes(to_click)
+            changed = changed or bool(to_click)
         
-        print("Waiting 5 seconds for currency filters to apply...")
-        time.sleep(5)
+        if changed:
+            print("Waiting for currency filters to apply...")
+            wait_for_table_refresh(old_row)
         return True
         
     except Exception as e:
@@ -375,7 +606,7 @@ def extract_year_from_week_range(week_range):
     if not week_range:
         return ""
     try:
-        year_match = re.search(r'\d{4}$', week_range)
+        year_match = YEAR_SUFFIX_RE.search(week_range)
         if year_match:
             return year_match.group(0)
         if ',' in week_range:
@@ -384,10 +615,83 @@ def extract_year_from_week_range(week_range):
     except:
         return ""
 
+def decode_holiday_row(row, row_data):
+    """Fill row_data for a holiday row from its COLLECT_ROWS_JS entry."""
+    # For holiday events, the event name is in a different structure
+    event_name = row["eventText"] or ""
+    row_data["Event"] = event_name if event_name else "Holiday"
+
+    # Try to extract the specific date from the event if possible
+    date_match = DATE_IN_EVENT_RE.search(event_name) if event_name else None
+    if date_match:
+        row_data["Date"] = date_match.group(1)
+
+    # If no specific currency, mark as GLOBAL
+    row_data["Currency"] = row["currency"] if row["currency"] is not None else "GLOBAL"
+    row_data["Impact"] = "holiday"
+    row_data["IsHoliday"] = "True"
+    row_data["Time"] = "All Day"
+    return row_data
+
+def decode_meeting_row(row, row_data):
+    """Fill row_data for a meeting/special event row from its COLLECT_ROWS_JS entry."""
+    event_name = row["eventText"] or ""
+    row_data["Event"] = event_name if event_name else "Special Event"
+    row_data["Currency"] = row["currency"] if row["currency"] is not None else "GLOBAL"
+    row_data["Impact"] = "special"
+    row_data["IsHoliday"] = "True"
+    return row_data
+
+def decode_regular_row(row, row_data):
+    """Fill row_data for a regular event row from its COLLECT_ROWS_JS entry."""
+    row_data["Time"] = row["time"] or "All Day"
+
+    if row["currency"] is not None:
+        row_data["Currency"] = row["currency"]
+
+    if row["eventLink"] is not None:
+        row_data["Event"] = row["eventLink"]
+
+    impact_class = row["impactClass"]
+    if impact_class is not None:
+        if "high" in impact_class:
+            row_data["Impact"] = "high"
+        elif "medium" in impact_class:
+            row_data["Impact"] = "medium"
+        elif "low" in impact_class:
+            row_data["Impact"] = "low"
+        else:
+            row_data["Impact"] = "none"
+
+    for key, field in (("Actual", "actual"), ("Forecast", "forecast"), ("Previous", "previous")):
+        if row[field] is not None:
+            row_data[key] = row[field]
+    return row_data
+
+# Row kind (from ROW_KIND_RE) -> decoder; None means a regular event
+ROW_DECODERS = {
+    "holiday": decode_holiday_row,
+    "meeting": decode_meeting_row,
+    None: decode_regular_row
+}
+
 def collect_data():
+    """
+    Yield one row dict per calendar event in page order.
+    The week range globals are updated before the first row is yielded.
+    """
     global first_week_collected, last_week_collected
-    
-    week_range = get_current_week_range()
+
+    wait.until(CALENDAR_BODY_PRESENT)
+
+    # One WebDriver round-trip for the whole table instead of ~10 per row
+    rows = json_loads(driver.execute_script(COLLECT_ROWS_JS))
+
+    # The current-week nav bar is part of the same dump; only look it up
+    # separately if it was not rendered inside the table body
+    week_range = next((row["text"] for row in rows if "ec-table__nav" in row["classes"] and row["text"]), None)
+    if not week_range:
+        week_range = get_current_week_range()
     current_year = extract_year_from_week_range(week_range)
     
     if week_range:
@@ -395,224 +699,185 @@ def collect_data():
             first_week_collected = week_range
         last_week_collected = week_range
 
-    calendar_body = wait.until(EC.presence_of_element_located(
-        (By.CSS_SELECTOR, "div.ec-table__body#economicCalendarTable")
-    ))
-
-    data = []
     current_date = ""
-    all_elements = calendar_body.find_elements(By.XPATH, "./div")
 
-    for element in all_elements:
-        try:
-            classes = element.get_attribute("class") or ""
-
-            if "ec-table__title" in classes:
-                date_text = element.text.strip()
-                if current_year and ',' in date_text:
-                    current_date = f"{date_text.split(',')[0].strip()} {current_year}"
-                else:
-                    current_date = date_text
-
-            elif "ec-table__nav" in classes:
-                continue
+    for row in rows:
+        classes = row["classes"]
 
-            elif "ec-table__item" in classes:
-                if not current_date:
-                    current_date = "Unknown"
-
-                row_data = {
-                    "Date": current_date,
-                    "Time": "All Day",
-                    "Currency": "nan",
-                    "Event": "nan",
-                    "Impact": "nan",
-                    "Actual": "nan",
-                    "Forecast": "nan",
-                    "Previous": "nan",
-                    "WeekRange": week_range or "",
-                    "IsHoliday": "False"
-                }
-
-                # Handle holiday events specifically
-                if "ec-table__item_holiday" in classes:
-                    try:
-                        # For holiday events, the event name is in a different structure
-                        event_elem = element.find_element(By.CSS_SELECTOR, "div.ec-table__col_event")
-                        event_name = event_elem.text.strip()
-                        row_data["Event"] = event_name if event_name else "Holiday"
-                        
-                        # Try to extract the specific date from the event if possible
-                        if event_name and re.search(r'\d{1,2}\s+[A-Za-z]+\s+\d{4}', event_name):
-                            date_match = re.search(r'(\d{1,2}\s+[A-Za-z]+\s+\d{4})', event_name)
-                            row_data["Date"] = date_match.group(1)
-                        
-                        # Try to get currency for the holiday
-                        try:
-                            currency_elem = element.find_element(By.CSS_SELECTOR, "div.ec-table__col_currency div.ec-table__curency-name")
-                            row_data["Currency"] = currency_elem.text.strip()
-                        except:
-                            # If no specific currency, mark as GLOBAL
-                            row_data["Currency"] = "GLOBAL"
-
-                        row_data["Impact"] = "holiday"
-                        row_data["IsHoliday"] = "True"
-                        row_data["Time"] = "All Day"
-                        
-                    except Exception as e:
-                        print(f"Error parsing holiday event: {e}")
-                        row_data["Event"] = "Holiday"
-                        row_data["Currency"] = "GLOBAL"
-                        row_data["Impact"] = "holiday"
-                        row_data["IsHoliday"] = "True"
-
-                    data.append(row_data)
-                    continue
-
-                elif "ec-table__item_meeting" in classes:
-                    try:
-                        event_elem = element.find_element(By.CSS_SELECTOR, "div.ec-table__col_event")
-                        event_name = event_elem.text.strip()
-                        row_data["Event"] = event_name if event_name else "Special Event"
-
-                        try:
-                            currency_elem = element.find_element(By.CSS_SELECTOR, "div.ec-table__col_currency div.ec-table__curency-name")
-                            row_data["Currency"] = currency_elem.text.strip()
-                        except:
-                            row_data["Currency"] = "GLOBAL"
-
-                        row_data["Impact"] = "special"
-                        row_data["IsHoliday"] = "True"
-                    except Exception as e:
-                        print(f"Error parsing meeting/special event: {e}")
-                        row_data["Event"] = "Special Event"
-                        row_data["Currency"] = "UNKNOWN"
-                        row_data["Impact"] = "special"
-                        row_data["IsHoliday"] = "True"
-
-                    data.append(row_data)
-                    continue
-
-                # Regular events
-                try:
-                    time_elem = element.find_element(By.CSS_SELECTOR, "div.ec-table__col_time div")
-                    time_text = time_elem.text.strip()
-                    row_data["Time"] = time_text if time_text else "All Day"
-                except:
-                    row_data["Time"] = "All Day"
-
-                try:
-                    currency_elem = element.find_element(By.CSS_SELECTOR, "div.ec-table__col_currency div.ec-table__curency-name")
-                    row_data["Currency"] = currency_elem.text.strip()
-                except:
-                    pass
-
-                try:
-                    event_elem = element.find_element(By.CSS_SELECTOR, "div.ec-table__col_event a")
-                    row_data["Event"] = event_elem.text.strip()
-                except:
-                    pass
+        if "ec-table__title" in classes:
+            date_text = row["text"] or ""
+            if current_year and ',' in date_text:
+                current_date = f"{date_text.split(',')[0].strip()} {current_year}"
+            else:
+                current_date = date_text
 
-                try:
-                    impact_icon = element.find_element(By.CSS_SELECTOR, "span.ec-table__importance")
-                    impact_class = impact_icon.get_attribute("class") or ""
-                    if "high" in impact_class:
-                        row_data["Impact"] = "high"
-                    elif "medium" in impact_class:
-                        row_data["Impact"] = "medium"
-                    elif "low" in impact_class:
-                        row_data["Impact"] = "low"
-                    else:
-                        row_data["Impact"] = "none"
-                except:
-                    pass
+        elif "ec-table__nav" in classes:
+            continue
 
-                try:
-                    actual_elem = element.find_element(By.CSS_SELECTOR, "div.ec-table__col_actual span")
-                    row_data["Actual"] = actual_elem.text.strip()
-                except:
-                    pass
+        elif "ec-table__item" in classes:
+            if not current_date:
+                current_date = "Unknown"
+
+            row_data = {
+                "Date": current_date,
+                "Time": "All Day",
+                "Currency": "nan",
+                "Event": "nan",
+                "Impact": "nan",
+                "Actual": "nan",
+                "Forecast": "nan",
+                "Previous": "nan",
+                "WeekRange": week_range or "",
+                "IsHoliday": "False"
+            }
 
-                try:
-                    forecast_elem = element.find_element(By.CSS_SELECTOR, "div.ec-table__col_forecast")
-                    row_data["Forecast"] = forecast_elem.text.strip()
-                except:
-                    pass
+            kind = ROW_KIND_RE.search(classes)
+            decode = ROW_DECODERS[kind.group(1) if kind else None]
+            yield decode(row, row_data)
 
-                try:
-                    previous_elem = element.find_element(By.CSS_SELECTOR, "div.ec-table__col_previous div")
-                    row_data["Previous"] = previous_elem.text.strip()
-                except:
-                    pass
+def event_id_hash(event):
+    """
+    64-bit hash of an event's (Date, Time, Event, Currency) id, as stored in the .idx sidecar
+    """
+    key = f"{event.get('Date', '')}|{event.get('Time', '')}|{event.get('Event', '')}|{event.get('Currency', '')}"
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little')
 
-                data.append(row_data)
+def get_index_filename(filename):
+    """
+    Path of the event-id index kept next to an output CSV
+    """
+    return os.path.splitext(filename)[0] + ".idx"
 
-        except Exception as e:
-            print(f"Error processing element: {str(e)}")
-            continue
+def load_seen_event_ids(filename):
+    """
+    Load the ids of events already saved in filename. Runs once per output file.
+    Reads the .idx sidecar when it covers the whole CSV; otherwise rebuilds it from one pass over the CSV.
+    Returns False when no usable index could be built, so the run must not append to one.
+    """
+    _seen_event_ids.clear()
+    index_filename = get_index_filename(filename)
+
+    if os.path.exists(index_filename):
+        if os.path.exists(filename):
+            with open(index_filename, 'rb') as f:
+                data = f.read()
+            # The header must match the CSV byte for byte; a replaced CSV or an
+            # index lagging it after an interrupted run both show up as a size mismatch
+            covered_size = int.from_bytes(data[:INDEX_HEADER_SIZE], 'little')
+            if len(data) >= INDEX_HEADER_SIZE and covered_size == os.path.getsize(filename):
+                # Drop a partial trailing entry left by an interrupted run
+                data = data[INDEX_HEADER_SIZE:len(data) - (len(data) - INDEX_HEADER_SIZE) % 8]
+                hashes = array('Q')
+                hashes.frombytes(data)
+                if sys.byteorder != 'little':
+                    hashes.byteswap()
+                _seen_event_ids.update(hashes)
+                return True
+        print(f"Event index {os.path.basename(index_filename)} does not match its CSV, rebuilding it")
+        os.remove(index_filename)
+
+    if not os.path.exists(filename):
+        return True
 
-    return sorted(data, key=lambda x: (x["Date"], x["Time"]))
+    try:
+        csv_size = os.path.getsize(filename)
+        with open(filename, 'r', encoding='utf-8') as f:
+            hashes = [event_id_hash(row) for row in csv.DictReader(f)]
+        _seen_event_ids.update(hashes)
+        with open(index_filename, 'wb') as f:
+            f.write(csv_size.to_bytes(INDEX_HEADER_SIZE, 'little'))
+            f.write(b"".join(h.to_bytes(8, 'little') for h in hashes))
+        return True
+    except Exception as e:
+        print(f"Warning: Could not read existing file to check for duplicates: {e}")
+        return False
 
-def save_events(events, filename):
+@contextmanager
+def open_output_file(filename):
     """
-    Save events to CSV. Always appends to existing file, never overwrites.
+    Open the output CSV in append mode and its .idx sidecar once for the rest of the run.
+    Yields (csv_writer, csv_file, index_file); index_file is None when the index can't be trusted.
     """
-    existing_events = set()
+    global output_handle, index_handle
     file_exists = os.path.exists(filename)
-
-    # Read existing events to avoid duplicates
-    if file_exists:
-        try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    event_id = (row.get("Date", ""), row.get("Time", ""), row.get("Event", ""), row.get("Currency", ""))
-                    existing_events.add(event_id)
-        except Exception as e:
-            print(f"Warning: Could not read existing file to check for duplicates: {e}")
-
-    # Filter out events that already exist in the file
-    new_events = []
-    for event in events:
-        event_id = (event["Date"], event["Time"], event["Event"], event["Currency"])
-        if event_id not in existing_events:
-            event_to_save = {
-                "Date": event["Date"],
-                "Time": event["Time"],
-                "Currency": event["Currency"],
-                "Event": event["Event"],
-                "Impact": event["Impact"],
-                "Actual": event["Actual"],
-                "Forecast": event["Forecast"],
-                "Previous": event["Previous"],
-                "IsHoliday": event["IsHoliday"],
-                "WeekRange": event.get("WeekRange", "")
-            }
-            new_events.append(event_to_save)
-
-    if not new_events:
-        return 0
-
-    fieldnames = ["Date", "Time", "Currency", "Event", "Impact", "Actual", "Forecast", "Previous", "IsHoliday", "WeekRange"]
-
-    # Always append to the file, never overwrite
-    with open(filename, 'a', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
+    index_filename = get_index_filename(filename)
+    index_usable = load_seen_event_ids(filename)
+    if index_usable and not os.path.exists(index_filename):
+        # New CSV: an empty index covering zero bytes
+        with open(index_filename, 'wb') as new_index:
+            new_index.write((0).to_bytes(INDEX_HEADER_SIZE, 'little'))
+
+    # Always append to the file, never overwrite. A 1 MiB buffer keeps small
+    # row writes from turning into syscalls on slow Docker volume mounts.
+    with open(filename, 'a', newline='', encoding='utf-8', buffering=CSV_WRITE_BUFFER) as f, \
+            (open(index_filename, 'r+b') if index_usable else nullcontext()) as index_file:
+        writer = csv.writer(f)
         # Only write header if file is new
         if not file_exists:
-            writer.writeheader()
-        writer.writerows(new_events)
+            writer.writerow(CSV_FIELDNAMES)
+        output_handle = f
+        index_handle = index_file
+        try:
+            yield writer, f, index_file
+        finally:
+            output_handle = None
+            index_handle = None
+
+def commit_event_ids(csv_file, index_file, pending_hashes):
+    """
+    Flush the CSV, then record the ids of the rows just written in the .idx sidecar
+    along with the CSV size they bring it up to. The index never holds an id whose
+    row hasn't reached the CSV.
+    """
+    csv_file.flush()
+    if index_file is not None:
+        index_file.seek(0, os.SEEK_END)
+        index_file.write(b"".join(pending_hashes))
+        # Seeking flushes the ids first, so the header never claims rows the index lacks
+        index_file.seek(0)
+        index_file.write(os.fstat(csv_file.fileno()).st_size.to_bytes(INDEX_HEADER_SIZE, 'little'))
+        index_file.flush()
+    pending_hashes.clear()
+
+def save_events(events, writer, csv_file, index_file):
+    """
+    Write events to the open output CSV as they arrive, skipping ones already saved.
+    """
+    saved = 0
+    pending_hashes = []
+    try:
+        for event in events:
+            event_hash = event_id_hash(event)
+            if event_hash in _seen_event_ids:
+                continue
+            _seen_event_ids.add(event_hash)
+
+            # Same column order as CSV_FIELDNAMES
+            writer.writerow((
+                event["Date"], event["Time"], event["Currency"], event["Event"], event["Impact"],
+                event["Actual"], event["Forecast"], event["Previous"], event["IsHoliday"],
+                event.get("WeekRange", "")
+            ))
+            pending_hashes.append(event_hash.to_bytes(8, 'little'))
+            saved += 1
+            if len(pending_hashes) >= INDEX_COMMIT_ROWS:
+                commit_event_ids(csv_file, index_file, pending_hashes)
+    finally:
+        commit_event_ids(csv_file, index_file, pending_hashes)
+    return saved
 
-    return len(new_events)
+@lru_cache(maxsize=32)
+def _settings_hash_cached(currencies, importance):
+    settings_str = f"{'_'.join(currencies)}|{'_'.join(importance)}"
+    return hashlib.md5(settings_str.encode()).hexdigest()
 
 def get_settings_hash(selected_currencies, selected_importance):
     """
     Create a unique hash for the current settings
     """
-    currencies_str = "_".join(sorted([c.upper() for c in selected_currencies]))
-    importance_str = "_".join(sorted([i.title() for i in selected_importance]))
-    settings_str = f"{currencies_str}|{importance_str}"
-    return hashlib.md5(settings_str.encode()).hexdigest()
+    currencies = tuple(sorted(c.upper() for c in selected_currencies))
+    importance = tuple(sorted(i.title() for i in selected_importance))
+    return _settings_hash_cached(currencies, importance)
 
 def create_dynamic_filename(cfg, first_week, last_week, output_folder):
     """
@@ -626,7 +891,7 @@ def create_dynamic_filename(cfg, first_week, last_week, output_folder):
     def clean_week_string(week_str):
         if not week_str:
             return "UNKNOWN"
-        cleaned = re.sub(r'[\\/*?:"<>|]', "", week_str.replace(" ", "_"))
+        cleaned = ILLEGAL_FILENAME_CHARS_RE.sub("", week_str.replace(" ", "_"))
         return cleaned[:50] if len(cleaned) > 50 else cleaned
     
     first_clean = clean_week_string(first_week)
@@ -642,6 +907,37 @@ def create_dynamic_filename(cfg, first_week, last_week, output_folder):
     
     return os.path.join(output_folder, filename)
 
+def create_webdriver(chrome_options):
+    """
+    Start a WebDriver session, on the remote service when one is configured
+    """
+    if RUNTIME.remote_webdriver_url:
+        print(f"Opening session on remote WebDriver at {RUNTIME.remote_webdriver_url}")
+        # The Chromium connection registers the goog/cdp endpoint, so DevTools
+        # commands (resource blocking) still work on the remote session
+        connection = ChromiumRemoteConnection(
+            RUNTIME.remote_webdriver_url, vendor_prefix="goog", browser_name="chrome"
+        )
+        return webdriver.Remote(command_executor=connection, options=chrome_options)
+    return webdriver.Chrome(options=chrome_options)
+
+def block_heavy_resources(driver):
+    """
+    Block images, fonts, media and trackers at the network layer via CDP
+    """
+    def execute_cdp(cmd, params):
+        if hasattr(driver, "execute_cdp_cmd"):
+            return driver.execute_cdp_cmd(cmd, params)
+        # Remote sessions reach CDP through the goog/cdp endpoint registered by
+        # ChromiumRemoteConnection in create_webdriver
+        return driver.execute("executeCdpCommand", {"cmd": cmd, "params": params})
+
+    try:
+        execute_cdp("Network.enable", {})
+        execute_cdp("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    except Exception as e:
+        print(f"Resource blocking skipped, pages will load in full: {e}")
+
 def initialize_driver(headless=True):
     """
     Initialize Chrome driver optimized for headless operation
@@ -649,34 +945,41 @@ def initialize_driver(headless=True):
     chrome_options = Options()
     
     # Essential options for headless operation
-    chrome_options.add_argument("--headless=new")
+    if headless:
+        chrome_options.add_argument("--headless=new")
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
     chrome_options.add_argument("--disable-gpu")
     
+    # Expose DevTools inside the container for debugging a running scrape; a remote
+    # browser lives in another container, so the flags would be meaningless there
+    if RUNTIME.docker and not RUNTIME.remote_webdriver_url:
+        chrome_options.add_argument("--remote-debugging-port=9222")
+        chrome_options.add_argument("--remote-debugging-address=0.0.0.0")
+    
     # Window and rendering options
     chrome_options.add_argument("--window-size=1920,1080")
     chrome_options.add_argument("--disable-extensions")
     chrome_options.add_argument("--disable-plugins")
     
     # Performance and resource optimization
+    # Images are never read, so skip downloading and decoding them.
+    # JavaScript must stay enabled: the calendar and its filters are rendered client-side.
     chrome_options.add_argument("--disable-images")
     chrome_options.add_argument("--blink-settings=imagesEnabled=false")
-    chrome_options.add_argument("--disable-javascript")
+    # Keep timers and rendering running at full speed in a background/headless tab
     chrome_options.add_argument("--disable-background-timer-throttling")
     chrome_options.add_argument("--disable-backgrounding-occluded-windows")
     chrome_options.add_argument("--disable-renderer-backgrounding")
     
-    # Security and network options
-    chrome_options.add_argument("--disable-web-security")
-    chrome_options.add_argument("--disable-features=TranslateUI")
+    # Startup options: no first-run UI or bundled background extensions
     chrome_options.add_argument("--disable-ipc-flooding-protection")
     chrome_options.add_argument("--no-first-run")
     chrome_options.add_argument("--disable-default-apps")
     chrome_options.add_argument("--disable-component-extensions-with-background-pages")
     
-    # Set user agent for headless mode
-    chrome_options.add_argument("--user-agent=Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+    # Set user agent for headless mode (a different one per session)
+    chrome_options.add_argument(f"--user-agent={random.choice(USER_AGENTS)}")
     
     # Experimental options for better headless performance
     chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
@@ -689,11 +992,12 @@ def initialize_driver(headless=True):
     
     try:
         print(f"Initializing Chrome driver in {'headless' if headless else 'GUI'} mode...")
-        driver = webdriver.Chrome(options=chrome_options)
-        driver.implicitly_wait(10)
+        driver = create_webdriver(chrome_options)
+        driver.implicitly_wait(0)  # explicit WebDriverWaits only; optional lookups return immediately
         
         # Additional configurations for headless stability
         driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        block_heavy_resources(driver)
         
         return driver
     except Exception as e:
@@ -701,12 +1005,13 @@ def initialize_driver(headless=True):
         # Fallback: try without some experimental options
         try:
             chrome_options = Options()
-            chrome_options.add_argument("--headless=new")
+            if headless:
+                chrome_options.add_argument("--headless=new")
             chrome_options.add_argument("--no-sandbox")
             chrome_options.add_argument("--disable-dev-shm-usage")
             chrome_options.add_argument("--window-size=1920,1080")
-            driver = webdriver.Chrome(options=chrome_options)
-            driver.implicitly_wait(10)
+            driver = create_webdriver(chrome_options)
+            driver.implicitly_wait(0)  # explicit WebDriverWaits only; optional lookups return immediately
             print("Fallback driver initialization successful")
             return driver
         except Exception as e2:
@@ -720,7 +1025,7 @@ def parse_env_or_args():
     parser.add_argument("--importance", nargs="*", type=str, default=["ALL"],
                        help="Importance levels (e.g., High Medium) or 'ALL' for all levels. Available: " + ", ".join(IMPORTANCE_LABELS.keys()) + ", ALL")
     parser.add_argument("--output", type=str, default=None, help="Output CSV path")
-    parser.add_argument("--headless", action="store_true", default=True, help="Run Chrome in headless mode (default: True)")
+    parser.add_argument("--headless", action="store_true", default=RUNTIME.headless, help="Run Chrome in headless mode (default: True unless HEADLESS=false)")
     parser.add_argument("--start-url", type=str, default="https://www.mql5.com/en/economic-calendar", help="Calendar URL")
     parser.add_argument("--list-options", action="store_true", help="List all available currency and importance options")
 
@@ -754,32 +1059,31 @@ def parse_env_or_args():
         importance = ["ALL"]
         print("No importance levels specified. Using default: ALL importance levels")
 
+    # Validate on the casefolded names, deduplicated in the order given (the filename
+    # is built from that order); "ALL" wins outright
     valid_currencies = []
     if currencies:
-        for curr in currencies:
-            if curr.upper() == "ALL":
-                valid_currencies = ["ALL"]
-                break
-            elif curr.upper() in CURRENCY_LABELS:
-                valid_currencies.append(curr.upper())
-            else:
-                print(f"Warning: Unknown currency '{curr}'. Available: {', '.join(CURRENCY_LABELS.keys())}, ALL")
+        requested = dict.fromkeys(curr.strip() for curr in currencies)
+        folded = dict.fromkeys(curr.casefold() for curr in requested)
+        if "all" in folded:
+            valid_currencies = ["ALL"]
+        else:
+            valid_currencies = [_CURRENCY_FOLD[c] for c in folded if c in _CURRENCY_FOLD]
+            unknown = [curr for curr in requested if curr.casefold() not in _CURRENCY_FOLD]
+            if unknown:
+                print(f"Warning: Unknown currencies {', '.join(unknown)}. Available: {', '.join(CURRENCY_LABELS.keys())}, ALL")
 
     valid_importance = []
     if importance:
-        for imp in importance:
-            if imp.upper() == "ALL":
-                valid_importance = ["ALL"]
-                break
-            matched = None
-            for key in IMPORTANCE_LABELS.keys():
-                if imp.strip().lower() == key.lower():
-                    matched = key
-                    break
-            if matched:
-                valid_importance.append(matched)
-            else:
-                print(f"Warning: Unknown importance '{imp}'. Available: {', '.join(IMPORTANCE_LABELS.keys())}, ALL")
+        requested = dict.fromkeys(imp.strip() for imp in importance)
+        folded = dict.fromkeys(imp.casefold() for imp in requested)
+        if "all" in folded:
+            valid_importance = ["ALL"]
+        else:
+            valid_importance = [_IMPORTANCE_FOLD[i] for i in folded if i in _IMPORTANCE_FOLD]
+            unknown = [imp for imp in requested if imp.casefold() not in _IMPORTANCE_FOLD]
+            if unknown:
+                print(f"Warning: Unknown importance levels {', '.join(unknown)}. Available: {', '.join(IMPORTANCE_LABELS.keys())}, ALL")
 
     if not valid_currencies:
         print("No valid currencies specified. Using default: ALL currencies")
@@ -806,18 +1110,14 @@ def main():
     # EXTRACTED FROM OLD CODE: Get the previous month name
     previous_month = get_previous_month_name()
     
-    # Use Docker path when in Docker mode, otherwise use Windows path
-    if os.environ.get('DOCKER_MODE') == 'true':
-        main_folder_path = DEFAULT_OUTPUT_DIR
-    else:
-        main_folder_path = DEFAULT_OUTPUT_DIR
+    # Docker path when in Docker mode, otherwise OUTPUT_DIR or ./data
+    main_folder_path = RUNTIME.output_dir
     
     # EXTRACTED FROM OLD CODE: Create the main folder path with the month-specific subfolder
-    month_folder = f"{previous_month} Batch"
-    output_folder = os.path.join(main_folder_path, month_folder)
+    output_folder = Path(main_folder_path) / f"{previous_month} Batch"
     
     # EXTRACTED FROM OLD CODE: Create the folder if it doesn't exist
-    os.makedirs(output_folder, exist_ok=True)
+    output_folder.mkdir(parents=True, exist_ok=True)
     print(f"Using output folder: {output_folder}")
 
     # Create settings hash
@@ -839,8 +1139,11 @@ def main():
             except Exception as e:
                 print(f"Attempt {attempt + 1} failed: {e}")
                 if attempt < 2:
-                    print("Retrying in 5 seconds...")
-                    time.sleep(5)
+                    # Exponential backoff capped at 5s, jittered so retries don't
+                    # land on a fixed cadence; the first retry is near-instant
+                    delay = min(5, 0.25 * 2 ** attempt) * random.uniform(0.5, 1.5)
+                    print(f"Retrying in {delay:.2f} seconds...")
+                    time.sleep(delay)
                 else:
                     raise
         
@@ -852,14 +1155,15 @@ def main():
                 wait = WebDriverWait(driver, 30)
                 
                 # Wait for the main calendar table to be present
-                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div#economicCalendarTable")))
+                wait.until(CALENDAR_TABLE_PRESENT)
                 print("Page loaded successfully")
                 break
             except Exception as e:
                 print(f"Page load attempt {attempt + 1} failed: {e}")
                 if attempt < 2:
-                    print("Retrying in 5 seconds...")
-                    time.sleep(5)
+                    delay = min(5, 0.25 * 2 ** attempt) * random.uniform(0.5, 1.5)
+                    print(f"Retrying in {delay:.2f} seconds...")
+                    time.sleep(delay)
                 else:
                     print("Failed to load page after 3 attempts")
                     raise
@@ -882,18 +1186,24 @@ def main():
         # Step 3: Collect data for the previous month
         print("Collecting data for the previous month...")
         try:
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div.ec-table__item")))
-            time.sleep(3)  # Wait for any dynamic content to load
+            wait.until(CALENDAR_ITEM_PRESENT)
+            wait_for_row_count_stable()  # Wait for any dynamic content to load
         except:
             print("Timed out waiting for events - continuing anyway")
 
-        week_data = collect_data()
+        events = collect_data()
+        
+        # The week range is read when the generator starts, so pull the first
+        # event before the filename is built from it
+        first_event = next(events, None)
+        pending = [] if first_event is None else [first_event]
         
         # Create output file
         output_file = create_dynamic_filename(cfg, first_week_collected, last_week_collected, output_folder)
         print(f"Created output file: {os.path.basename(output_file)}")
         
-        events_saved = save_events(week_data, output_file)
+        with open_output_file(output_file) as (writer, csv_file, index_file):
+            events_saved = save_events(itertools.chain(pending, events), writer, csv_file, index_file)
         print(f"Collected {events_saved} events for the previous month")
 
         print("\nData collection for previous month completed successfully!")
@@ -904,10 +1214,10 @@ def main():
         traceback.print_exc()
 
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        screenshot_file = os.path.join(output_folder, f"error_{timestamp}.png")
+        screenshot_file = output_folder / f"error_{timestamp}.png"
         try:
             if driver:
-                driver.save_screenshot(screenshot_file)
+                driver.save_screenshot(str(screenshot_file))
                 print(f"Screenshot saved to {screenshot_file}")
         except:
             print("Failed to save screenshot")
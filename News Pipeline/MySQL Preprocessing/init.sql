@@ -23,21 +23,6 @@ CREATE TABLE IF NOT EXISTS events (
 );
 SELECT 'Table events created (or already exists).' AS Info;
 
--- Create view for consistent date formatting
-CREATE OR REPLACE VIEW events_formatted AS
-SELECT 
-    id,
-    DATE_FORMAT(Date, '%e %M %Y') as Date,
-    Time,
-    Currency,
-    Event,
-    Impact,
-    Actual,
-    Forecast,
-    Previous
-FROM events;
-SELECT 'View events_formatted created (or replaced).' AS Info;
-
 -- Training metrics table
 CREATE TABLE IF NOT EXISTS train_metrics (
     id INT AUTO_INCREMENT PRIMARY KEY,
@@ -6,11 +6,36 @@ from datetime import datetime
 import glob
 import math
 import re
+import itertools
+import tempfile
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv(r"C:/Users/Map/your/own/volume/here\.env")
 
+# Column order of the events INSERT statement
+INSERT_COLUMNS = ["Date", "Time", "Currency", "Event", "Impact", "Actual", "Forecast", "Previous"]
+
+# Patterns used by the scalar date/time parsers
+_ISO_DATE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+_HHMM = re.compile(r'^\d{1,2}:\d{2}$')
+_AMPM = re.compile(r'(?i)(AM|PM)')
+
+# parse_date's formats in the order it tries them, for the vectorized passes
+DATE_FORMATS = [
+    "%Y-%m-%d", "%d %B %Y",
+    "%m/%d/%Y", "%d/%m/%Y", "%Y/%m/%d",
+    "%m-%d-%Y", "%d-%m-%Y",
+    "%b %d, %Y", "%B %d, %Y"
+]
+
+# Text columns and the placeholder values normalised to "N/A"
+TEXT_COLUMNS = ["Currency", "Event", "Impact", "Actual", "Forecast", "Previous"]
+EMPTY_TEXT_VALUES = ["", "nan", "None", "null", "NULL"]
+
+# Write buffer for the LOAD DATA dump file (1 MiB blocks instead of 8 KiB)
+DUMP_WRITE_BUFFER = 1 << 20
+
 def wait_for_mysql_startup(host=None, user=None, password=None, database=None, max_wait=120):
     """Wait until MySQL is ready to accept connections."""
     # Get credentials from environment variables with fallbacks
@@ -55,7 +80,7 @@ def parse_date(date_str):
         date_str = str(date_str).strip()
         
         # Handle '2007-01-10' format (MySQL DATE format)
-        if re.match(r'^\d{4}-\d{2}-\d{2}$', date_str):
+        if _ISO_DATE.match(date_str):
             return datetime.strptime(date_str, "%Y-%m-%d").date()
         
         # Handle '10 January 2007' format
@@ -99,11 +124,11 @@ def parse_time(time_str):
         time_str = str(time_str).strip()
         
         # Handle '14:30' format
-        if re.match(r'^\d{1,2}:\d{2}$', time_str):
+        if _HHMM.match(time_str):
             return datetime.strptime(time_str, "%H:%M").time()
         
         # Handle '2:30 PM' format
-        if 'AM' in time_str.upper() or 'PM' in time_str.upper():
+        if _AMPM.search(time_str):
             try:
                 time_obj = datetime.strptime(time_str, "%I:%M %p").time()
                 return time_obj
@@ -111,7 +136,7 @@ def parse_time(time_str):
                 pass
         
         # Handle 24-hour format without leading zero
-        if re.match(r'^\d{1,2}:\d{2}$', time_str):
+        if _HHMM.match(time_str):
             parts = time_str.split(':')
             if len(parts) == 2:
                 hour = int(parts[0])
@@ -126,18 +151,97 @@ def parse_time(time_str):
         print(f"❌ Error parsing time '{time_str}': {e}")
         return None
 
-def clean_text_value(value):
-    """Clean and standardize text values"""
-    if pd.isna(value) or str(value).strip() == "":
-        return "N/A"
-    
-    value_str = str(value).strip()
-    
-    # Remove extra whitespace and normalize empty values
-    if value_str in ["", "nan", "None", "null", "NULL"]:
-        return "N/A"
-    
-    return value_str
+def parse_date_column(dates):
+    """Vectorized parse_date: one strict pd.to_datetime pass per format, scalar parse_date only for leftovers"""
+    dates = dates.astype(str).str.strip()
+    parsed = pd.Series(pd.NaT, index=dates.index, dtype="datetime64[ns]")
+
+    # Explicit formats only: format="mixed" would hand every value to dateutil
+    missing = dates != ""
+    for fmt in DATE_FORMATS:
+        parsed[missing] = pd.to_datetime(dates[missing], format=fmt, errors="coerce")
+        missing = parsed.isna() & (dates != "")
+        if not missing.any():
+            break
+
+    result = parsed.dt.date.astype(object).where(parsed.notna(), None)
+
+    # Anything still unparsed goes through the legacy format list
+    missing = parsed.isna() & (dates != "")
+    if missing.any():
+        result[missing] = dates[missing].apply(parse_date)
+    return result
+
+def parse_time_column(times):
+    """Vectorized parse_time: strict '14:30' and '2:30 PM' passes, scalar parse_time only for leftovers"""
+    times = times.astype(str).str.strip()
+    parsed = pd.Series(pd.NaT, index=times.index, dtype="datetime64[ns]")
+
+    hhmm = times.str.match(_HHMM)
+    if hhmm.any():
+        parsed[hhmm] = pd.to_datetime(times[hhmm], format="%H:%M", errors="coerce")
+    missing = parsed.isna() & (times != "")
+    if missing.any():
+        parsed[missing] = pd.to_datetime(times[missing], format="%I:%M %p", errors="coerce")
+
+    result = parsed.dt.time.astype(object).where(parsed.notna(), None)
+
+    missing = parsed.isna() & (times != "")
+    if missing.any():
+        result[missing] = times[missing].apply(parse_time)
+    return result
+
+def bulk_load_events(cursor, df):
+    """Load rows via LOAD DATA LOCAL INFILE into a staging table, then upsert into events"""
+    columns = ", ".join(INSERT_COLUMNS)
+    tmp = tempfile.NamedTemporaryFile(
+        mode="w", suffix=".tsv", delete=False, encoding="utf-8", buffering=DUMP_WRITE_BUFFER
+    )
+    try:
+        with tmp:
+            # csv-module quoting only ("" inside quoted fields), no backslash escapes
+            df[INSERT_COLUMNS].to_csv(
+                tmp, index=False, header=False, sep="\t", na_rep="NULL", lineterminator="\n"
+            )
+
+        # Same columns as events but no unique key, so every row lands in the stage and
+        # the upsert below lets the last duplicate win, as the executemany fallback does
+        cursor.execute("DROP TEMPORARY TABLE IF EXISTS events_stage")
+        cursor.execute(f"""
+            CREATE TEMPORARY TABLE events_stage (seq INT AUTO_INCREMENT PRIMARY KEY)
+            SELECT {columns} FROM events LIMIT 0
+        """)
+        cursor.execute(
+            f"""
+            LOAD DATA LOCAL INFILE %s INTO TABLE events_stage
+            CHARACTER SET utf8mb4
+            FIELDS TERMINATED BY '\\t' OPTIONALLY ENCLOSED BY '"' ESCAPED BY ''
+            LINES TERMINATED BY '\\n'
+            ({columns})
+            """,
+            (tmp.name.replace("\\", "/"),)
+        )
+
+        # LOCAL downgrades truncation and strict-mode errors to warnings; treat any as a failure
+        cursor.execute("SHOW WARNINGS")
+        warnings = cursor.fetchall()
+        if warnings:
+            raise mysql.connector.errors.DataError(
+                msg=f"LOAD DATA reported {len(warnings)} warning(s), first: {warnings[0]}"
+            )
+
+        cursor.execute(f"""
+            INSERT INTO events ({columns})
+            SELECT {columns} FROM events_stage s ORDER BY s.seq
+            ON DUPLICATE KEY UPDATE
+                Impact = s.Impact,
+                Actual = s.Actual,
+                Forecast = s.Forecast,
+                Previous = s.Previous
+        """)
+        cursor.execute("DROP TEMPORARY TABLE events_stage")
+    finally:
+        os.remove(tmp.name)
 
 def import_csv_data():
     # Get database configuration from environment variables
@@ -167,6 +271,8 @@ def import_csv_data():
         csv_file = find_csv_file(data_folder)
         print(f"📂 Loading CSV file: {csv_file}", flush=True)
 
+        # Multithreaded Arrow parser; every column stays text (keep "NA" and
+        # empty cells as-is, they are normalised to "N/A" below)
         df = pd.read_csv(
             csv_file,
             header=None,
@@ -175,9 +281,10 @@ def import_csv_data():
                 "Actual", "Forecast", "Previous", "IsHoliday", "WeekRange"
             ],
             quotechar='"',
-            skipinitialspace=True,
-            na_filter=False,
-            low_memory=False
+            keep_default_na=False,
+            na_values=[],
+            dtype="string[pyarrow]",
+            engine="pyarrow"
         )
 
         # Drop unwanted columns
@@ -189,12 +296,12 @@ def import_csv_data():
 
         # Clean and parse data
         print("🔄 Parsing dates and times...")
-        df["Date"] = df["Date"].apply(parse_date)
-        df["Time"] = df["Time"].apply(parse_time)
+        df["Date"] = parse_date_column(df["Date"])
+        df["Time"] = parse_time_column(df["Time"])
         
-        # Clean text columns
-        for col in ["Currency", "Event", "Impact", "Actual", "Forecast", "Previous"]:
-            df[col] = df[col].apply(clean_text_value)
+        # Clean text columns: strip, and normalise empty/placeholder values to "N/A"
+        text = df[TEXT_COLUMNS].apply(lambda s: s.astype("string").str.strip())
+        df[TEXT_COLUMNS] = text.mask(text.isna() | text.isin(EMPTY_TEXT_VALUES), "N/A")
 
         # Remove rows with invalid dates or times
         initial_count = len(df)
@@ -216,7 +323,7 @@ def import_csv_data():
         df = df.sort_values(by="DateTime", ascending=True).reset_index(drop=True)
 
         # Connect to MySQL
-        connection = mysql.connector.connect(**db_config)
+        connection = mysql.connector.connect(**db_config, allow_local_infile=True)
         cursor = connection.cursor()
 
         # Ensure table exists with unique key (same as initialization script)
@@ -235,30 +342,17 @@ def import_csv_data():
             )
         """)
         
-        # Create the formatted view
-        cursor.execute("""
-            CREATE OR REPLACE VIEW events_formatted AS
-            SELECT 
-                id,
-                DATE_FORMAT(Date, '%e %M %Y') as Date,
-                Time,
-                Currency,
-                Event,
-                Impact,
-                Actual,
-                Forecast,
-                Previous
-            FROM events
-        """)
-        
         connection.commit()
 
         # Smart merge: filter only new rows based on last timestamp
-        cursor.execute("SELECT MAX(CONCAT(Date, ' ', Time)) FROM events")
-        last_timestamp = cursor.fetchone()[0]
-
-        if last_timestamp:
-            last_dt = pd.to_datetime(last_timestamp)
+        # ORDER BY on the key columns lets MySQL read the newest row straight
+        # from the (Date, Time, ...) index instead of scanning CONCAT() values
+        cursor.execute("SELECT Date, Time FROM events ORDER BY Date DESC, Time DESC LIMIT 1")
+        last_row = cursor.fetchone()
+
+        if last_row:
+            # mysql-connector returns TIME columns as timedelta
+            last_dt = pd.Timestamp(last_row[0]) + pd.Timedelta(last_row[1])
             df = df[df["DateTime"] > last_dt]
             print(f"🕒 Filtering for data after: {last_dt}")
 
@@ -280,38 +374,54 @@ def import_csv_data():
             Previous = VALUES(Previous)
         """
 
-        data_to_insert = [
-            (
-                row["Date"], row["Time"], row["Currency"], row["Event"],
-                row["Impact"], row["Actual"], row["Forecast"], row["Previous"]
-            )
-            for _, row in df.iterrows()
-        ]
-
-        total = len(data_to_insert)
-        chunk_size = 50
-        last_progress = -1
-
+        total = len(df)
         print(f"📤 Importing {total} new records...")
 
-        for i in range(0, total, chunk_size):
-            chunk = data_to_insert[i:i+chunk_size]
-            cursor.executemany(insert_query, chunk)
+        try:
+            # Bulk path: one file transfer instead of thousands of INSERT round-trips
+            bulk_load_events(cursor, df)
             connection.commit()
+            print("📈 Progress: 100%", flush=True)
+        except mysql.connector.Error as e:
+            # Server started without local_infile, or the load raised warnings: fall back to batched INSERTs
+            print(f"⚠️ LOAD DATA LOCAL INFILE failed ({e}), falling back to batched INSERT", flush=True)
+            connection.rollback()
+
+            # Plain tuples straight from the column arrays, pulled one chunk at a time
+            rows_iter = df[INSERT_COLUMNS].itertuples(index=False, name=None)
+
+            # One transaction for the whole import: a single commit/fsync instead of
+            # one per chunk. The undo log grows with the batch, which is fine at
+            # forex_events sizes.
+            chunk_size = 10000
+            last_progress = -1
+
+            inserted = 0
+
+            while True:
+                chunk = list(itertools.islice(rows_iter, chunk_size))
+                if not chunk:
+                    break
+                cursor.executemany(insert_query, chunk)
+                inserted += len(chunk)
+
+                progress = math.floor((inserted / total) * 100)
+                if progress != last_progress:
+                    print(f"📈 Progress: {progress}%", flush=True)
+                    last_progress = progress
 
-            progress = math.floor(((i + len(chunk)) / total) * 100)
-            if progress != last_progress:
-                print(f"📈 Progress: {progress}%", flush=True)
-                last_progress = progress
+            connection.commit()
 
         print(f"✅ Smart merge complete. {total} new records processed in ascending order.", flush=True)
         
         # Display sample of imported data
-        cursor.execute("SELECT Date, Time, Currency, Event FROM events_formatted ORDER BY id DESC LIMIT 5")
+        cursor.execute("SELECT Date, Time, Currency, Event FROM events ORDER BY id DESC LIMIT 5")
         sample_data = cursor.fetchall()
         print("📋 Sample of imported data (with formatted dates):")
         for row in sample_data:
-            print(f"   {row[0]} {row[1]} - {row[2]}: {row[3]}")
+            # Same '10 January 2007' layout the old DATE_FORMAT view produced
+            formatted_date = f"{row[0].day} {row[0].strftime('%B %Y')}"
+            print(f"   {formatted_date} {row[1]} - {row[2]}: {row[3]}")
 
     except Exception as e:
         print(f"❌ Data import failed: {e}", flush=True)
@@ -1,7 +1,9 @@
 from pathlib import Path
 from pyspark.sql import SparkSession
 from pyspark.sql.functions import col, regexp_replace, concat_ws, to_timestamp, trim
+from pyspark.sql.types import StructType, StructField, StringType
 import os
+import shutil
 import sys
 
 # -----------------------------
@@ -11,6 +13,13 @@ input_path = Path("/app/input")  # Maps to your "Merged Batch" folder
 output_path = Path("/app/output") # Maps to your "Arranged Batch" folder
 output_path.mkdir(exist_ok=True)  # create folder if not exists
 
+# Merged batch columns; every field is read as text and cleaned below
+CSV_SCHEMA = StructType([
+    StructField(name, StringType(), True)
+    for name in ["Date", "Time", "Currency", "Event", "Impact",
+                 "Actual", "Forecast", "Previous", "IsHoliday", "WeekRange"]
+])
+
 print("=== Configuration ===")
 print(f"Input path (container): {input_path}")
 print(f"Output path (container): {output_path}")
@@ -43,7 +52,12 @@ try:
     # -----------------------------
     # PROCESS LATEST CSV
     # -----------------------------
-    csv_files = list(input_path.glob("*.csv"))
+    # scandir entries carry cached stat results, so picking the newest file
+    # does not stat every candidate a second time
+    csv_files = []
+    if input_path.exists():
+        with os.scandir(input_path) as entries:
+            csv_files = [e for e in entries if e.name.endswith(".csv") and e.is_file()]
     print(f"Found {len(csv_files)} CSV files in input directory")
     
     if not csv_files:
@@ -52,19 +66,18 @@ try:
         sys.exit(1)
     else:
         # Get the most recently modified CSV file
-        csv_file = max(csv_files, key=lambda f: f.stat().st_mtime)
+        csv_file = Path(max(csv_files, key=lambda e: e.stat().st_mtime).path)
         print(f"Processing file: {csv_file.name}")
         print(f"File path: {csv_file}")
 
-        # Read CSV with explicit schema inference
+        # Read CSV with an explicit schema (inferSchema costs an extra full scan)
         df = spark.read \
             .option("header", "true") \
-            .option("inferSchema", "true") \
+            .schema(CSV_SCHEMA) \
             .option("encoding", "UTF-8") \
             .option("mode", "PERMISSIVE") \
             .csv(str(csv_file))
 
-        print(f"Original DataFrame count: {df.count()}")
         print(f"DataFrame columns: {df.columns}")
 
         # Trim all string columns
@@ -79,8 +92,12 @@ try:
         df = df.withColumn("DateTimeTemp", concat_ws(" ", col("Date"), col("Time")))
         df = df.withColumn("DateTimeTemp", to_timestamp(col("DateTimeTemp"), "d MMMM yyyy HH:mm"))
 
-        # Filter rows that failed parsing
+        # Cache once so both counts below share a single read of the file
+        df = df.cache()
         initial_count = df.count()
+        print(f"Original DataFrame count: {initial_count}")
+
+        # Filter rows that failed parsing
         df = df.filter(col("DateTimeTemp").isNotNull())
         filtered_count = df.count()
         
@@ -96,12 +113,6 @@ try:
             # Drop temp column
             df_sorted = df_sorted.drop("DateTimeTemp")
 
-            # -----------------------------
-            # CONVERT TO PANDAS AND SAVE
-            # -----------------------------
-            print("Converting to Pandas DataFrame...")
-            df_pandas = df_sorted.toPandas()
-
             # Construct output file name
             original_name = csv_file.stem  # filename without extension
             output_file = output_path / f"{original_name}_arranged.csv"
@@ -109,19 +120,33 @@ try:
             # -----------------------------
             # DELETE ANY EXISTING CSV FILES FIRST
             # -----------------------------
-            existing_csvs = list(output_path.glob("*.csv"))
+            with os.scandir(output_path) as entries:
+                existing_csvs = [e for e in entries if e.name.endswith(".csv") and e.is_file()]
             print(f"Found {len(existing_csvs)} existing CSV files in output directory")
             
             for old_file in existing_csvs:
                 try:
-                    os.remove(old_file)
+                    os.remove(old_file.path)
                     print(f"Deleted old file: {old_file.name}")
                 except Exception as e:
                     print(f"Could not delete {old_file.name}: {e}")
 
-            # Save CSV
+            # -----------------------------
+            # SAVE CSV DIRECTLY FROM SPARK
+            # -----------------------------
+            # Single part file in a scratch folder next to the output, then renamed;
+            # avoids collecting the whole dataset onto the driver with toPandas()
             print(f"Saving to: {output_file}")
-            df_pandas.to_csv(output_file, index=False, encoding="utf-8")
+            tmp_dir = output_path / f"_{original_name}_spark_tmp"
+            df_sorted.coalesce(1).write \
+                .option("header", "true") \
+                .option("encoding", "UTF-8") \
+                .option("escape", '"') \
+                .option("emptyValue", "") \
+                .mode("overwrite") \
+                .csv(str(tmp_dir))
+            shutil.move(str(next(tmp_dir.glob("part-*.csv"))), str(output_file))
+            shutil.rmtree(tmp_dir, ignore_errors=True)
             print(f"✓ Processed CSV saved to: {output_file}")
             print(f"✓ Output file size: {output_file.stat().st_size} bytes")
 
@@ -134,7 +159,7 @@ try:
 
             # Optional: show top 50 rows
             print("\nFirst 5 rows of processed data:")
-            print(df_pandas.head(5))
+            df_sorted.show(5, truncate=False)
 
             print("=== Processing completed successfully ===")
 
@@ -4,8 +4,13 @@ import re
 from pandas.tseries.offsets import DateOffset
 from datetime import datetime
 import numpy as np
+from pandas.api.types import union_categoricals
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import csv
+import io
+from collections import Counter
 import os
-import gc
 
 # ==== CONFIG - Using Environment Variables ====
 main_batch_folder = Path(os.getenv('MAIN_BATCH_FOLDER', '/app/data/main_batch'))
@@ -13,13 +18,21 @@ monthly_batches_root = Path(os.getenv('MONTHLY_BATCH_FOLDER', '/app/data/monthly
 output_folder = Path(os.getenv('OUTPUT_FOLDER', '/app/data/merged_batch'))
 output_folder.mkdir(parents=True, exist_ok=True)
 
+# Processed monthly batches are cached as Parquet, next to the sources by default
+cache_folder = Path(os.getenv('CACHE_FOLDER', str(monthly_batches_root / '.parquet_cache')))
+
+# Deep memory reports walk every object cell, so only run them when asked
+DEBUG = os.getenv('DEBUG', '').lower() in ('1', 'true', 'yes')
+
 print(f"📁 Using folders:")
 print(f"   Main Batch: {main_batch_folder}")
 print(f"   Monthly Batch: {monthly_batches_root}")
 print(f"   Output: {output_folder}")
+print(f"   Parquet cache: {cache_folder}")
 
 # Expected schema
 EXPECTED_COLUMNS = ['Date', 'Time', 'Currency', 'Event', 'Impact', 'Actual', 'Forecast', 'Previous', 'IsHoliday', 'WeekRange']
+EXPECTED_COL_COUNT = len(EXPECTED_COLUMNS)
 
 # Optimize data types for memory efficiency
 COLUMN_TYPES = {
@@ -35,6 +48,50 @@ COLUMN_TYPES = {
     'WeekRange': 'object'
 }
 
+# Dates that lost their year (e.g. "5 October, Monday", "October 5"),
+# as one alternation so each string is matched in a single pass
+BROKEN_DATE_RE = re.compile(
+    r'^(?:\d{1,2}\s+\w+,?\s*\w*day\s*'
+    r'|\w*day,?\s*\d{1,2}\s+\w+\s*'
+    r'|\d{1,2}\s+\w+\s*'
+    r'|\w+\s+\d{1,2}\s*)$',
+    re.IGNORECASE
+)
+YEAR_RE = re.compile(r'\b\d{4}\b')
+YEAR_SEARCH_RANGE = 20  # Rows either side of a broken date to take the year from
+WEEKDAY_RE = re.compile(r'\b(monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b,?\s*', re.IGNORECASE)
+MONTH_DAY_PATTERNS = [
+    re.compile(r'(\d{1,2})\s+(\w+)'),
+    re.compile(r'(\w+)\s+(\d{1,2})')
+]
+WEEKRANGE_YEAR_RE = re.compile(r',\s*(\d{4})$')
+ILLEGAL_FNAME_RE = re.compile(r'[<>:"/\\|?*]')
+
+# Month name/abbreviation -> number, for building dates without strptime
+MONTH_NAMES = ['january', 'february', 'march', 'april', 'may', 'june', 'july',
+               'august', 'september', 'october', 'november', 'december']
+MONTHS = {name: num for num, name in enumerate(MONTH_NAMES, 1)}
+MONTHS.update({name[:3]: num for num, name in enumerate(MONTH_NAMES, 1)})
+
+# "5 October 2020", "October 5 2020", "2020-10-05", "05/10/2020"
+DATE_PARSE_RE = re.compile(
+    r'^(?:(?P<d>\d{1,2})\s+(?P<m>[A-Za-z]+)\s+(?P<y>\d{4})'
+    r'|(?P<m2>[A-Za-z]+)\s+(?P<d2>\d{1,2})\s+(?P<y2>\d{4})'
+    r'|(?P<iso>\d{4}-\d{2}-\d{2})'
+    r'|(?P<a>\d{1,2})/(?P<b>\d{1,2})/(?P<y3>\d{4}))$'
+)
+
+# Formats tried in order when generating WeekRanges, one strict pass each
+DATE_FORMATS = [
+    '%d %B %Y',
+    '%d %b %Y',
+    '%B %d %Y',
+    '%b %d %Y',
+    '%Y-%m-%d',
+    '%d/%m/%Y',
+    '%m/%d/%Y'
+]
+
 def clear_output_folder():
     """Remove all files from the output folder to ensure only 1 file exists after saving"""
     for file_path in output_folder.glob("*"):
@@ -48,145 +105,168 @@ def optimize_dataframe(df):
     """Optimize DataFrame memory usage"""
     print("🔄 Optimizing DataFrame memory usage...")
     
-    original_memory = df.memory_usage(deep=True).sum() / 1024**2  # MB
+    if DEBUG:
+        original_memory = df.memory_usage(deep=True).sum() / 1024**2  # MB
     
     # Convert columns to optimal types
     for col in df.columns:
         if col in COLUMN_TYPES:
-            if COLUMN_TYPES[col] == 'category' and df[col].nunique() < len(df[col]) * 0.5:
-                df[col] = df[col].astype('category')
-            else:
-                df[col] = df[col].astype(COLUMN_TYPES[col])
+            # Always apply the declared dtype so every batch shares it
+            df[col] = df[col].astype(COLUMN_TYPES[col])
     
-    optimized_memory = df.memory_usage(deep=True).sum() / 1024**2  # MB
-    memory_saved = original_memory - optimized_memory
-    
-    print(f"💾 Memory usage: {original_memory:.2f}MB -> {optimized_memory:.2f}MB (saved {memory_saved:.2f}MB)")
+    if DEBUG:
+        optimized_memory = df.memory_usage(deep=True).sum() / 1024**2  # MB
+        memory_saved = original_memory - optimized_memory
+        
+        print(f"💾 Memory usage: {original_memory:.2f}MB -> {optimized_memory:.2f}MB (saved {memory_saved:.2f}MB)")
     
     return df
 
+def load_cached_batch(csv_path, cache_path):
+    """Return the cached processed batch when it is at least as new as its source CSV"""
+    try:
+        if cache_path.stat().st_mtime >= csv_path.stat().st_mtime:
+            df = pd.read_parquet(cache_path)
+            print(f"♻️ Using cached batch: {cache_path.name}")
+            return df
+    except Exception:
+        pass
+    return None
+
+def save_cached_batch(df, cache_path):
+    """Persist a processed batch as Parquet; caching is best-effort"""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(cache_path, index=False)
+    except Exception as e:
+        print(f"⚠️ Could not cache {cache_path.name}: {e}")
+
+def unify_categories(frames):
+    """Give shared category columns the same categories so concat keeps the category dtype"""
+    for col in frames[0].columns:
+        if all(isinstance(f[col].dtype, pd.CategoricalDtype) for f in frames):
+            categories = union_categoricals([f[col] for f in frames], ignore_order=True).categories
+            for f in frames:
+                f[col] = f[col].cat.set_categories(categories)
+    return frames
+
+def read_csv_as_text(source):
+    """Read every column of a CSV path or raw bytes as text with Arrow's multithreaded reader, falling back to the C engine"""
+    try:
+        if isinstance(source, bytes):
+            first_line = source.split(b'\n', 1)[0]
+        else:
+            with open(source, 'rb') as f:
+                first_line = f.readline()
+        header = next(csv.reader([first_line.decode('utf-8')]))
+        
+        # Blank or repeated header names are left to pandas, which renames them
+        if all(header) and len(set(header)) == len(header):
+            # Declare every column as string so values like "0.50" are kept verbatim
+            convert_options = pa_csv.ConvertOptions(
+                column_types={name: pa.string() for name in header},
+                strings_can_be_null=True
+            )
+            arrow_source = io.BytesIO(source) if isinstance(source, bytes) else source
+            return pa_csv.read_csv(arrow_source, convert_options=convert_options).to_pandas()
+    except Exception:
+        # Arrow rejects malformed rows outright; the C engine is more forgiving
+        pass
+    pandas_source = io.BytesIO(source) if isinstance(source, bytes) else source
+    return pd.read_csv(pandas_source, dtype=str, low_memory=False)
+
 def load_csv_with_memory_optimization(csv_path):
-    """Load CSV with memory optimization and chunking if needed"""
+    """Load CSV in one read, then optimize dtypes once on the full frame"""
     file_size = csv_path.stat().st_size / 1024**2  # Size in MB
     
     print(f"📦 Loading {csv_path.name} ({file_size:.2f} MB)")
     
-    if file_size > 100:  # If file is larger than 100MB, use chunking
-        print("   Using chunked loading for large file...")
-        chunks = []
-        for chunk in pd.read_csv(csv_path, chunksize=10000, low_memory=False):
-            chunks.append(optimize_dataframe(chunk))
-        df = pd.concat(chunks, ignore_index=True)
-    else:
-        df = pd.read_csv(csv_path, low_memory=False)
-        df = optimize_dataframe(df)
-    
-    return df
+    df = read_csv_as_text(csv_path)
+    return optimize_dataframe(df)
 
 def detect_and_fix_broken_rows(df):
     """Detect and fix broken rows where data is corrupted or missing columns"""
-    broken_rows = []
-    fixed_rows = []
+    cols_set = set(df.columns)
+    weekrange_col = 'WeekRange' if 'WeekRange' in cols_set else df.columns[-1]
     
-    # Check each row for issues
-    for idx, row in df.iterrows():
-        row_issues = []
-        
-        # Check if Date column has incomplete date (missing year)
-        if 'Date' in df.columns:
-            date_val = str(row['Date']).strip()
-            if is_broken_date(date_val):
-                row_issues.append(f"Broken date: '{date_val}'")
-        
-        # Check if WeekRange is missing
-        weekrange_col = 'WeekRange' if 'WeekRange' in df.columns else df.columns[-1]
-        if pd.isna(row[weekrange_col]) or str(row[weekrange_col]).strip() == '':
-            row_issues.append("Missing WeekRange")
-        
-        # Check if too many NaN values in a row
-        nan_count = row.isna().sum()
-        if nan_count > 3:
-            row_issues.append(f"Too many missing values: {nan_count}")
-        
-        if row_issues:
-            broken_rows.append((idx, row_issues))
-    
-    # Fix the broken rows
-    for idx, issues in broken_rows:
-        original_row = df.loc[idx].copy()
-        
-        # Fix broken date
-        if any("Broken date" in issue for issue in issues):
-            fixed_date = fix_broken_date(df, idx)
-            df.loc[idx, 'Date'] = fixed_date
-        
-        # Fix missing WeekRange
-        if any("Missing WeekRange" in issue for issue in issues):
-            fixed_weekrange = generate_weekrange_from_date(df.loc[idx, 'Date'])
-            weekrange_col = 'WeekRange' if 'WeekRange' in df.columns else df.columns[-1]
-            df.loc[idx, weekrange_col] = fixed_weekrange
-        
-        fixed_rows.append(idx)
+    # Check all rows at once with column masks
+    if 'Date' in cols_set:
+        broken_date = broken_date_mask(df['Date'])
+    else:
+        broken_date = pd.Series(False, index=df.index)
+    
+    weekranges = df[weekrange_col]
+    missing_weekrange = weekranges.isna() | (weekranges.astype(str).str.strip() == '')
+    
+    too_many_missing = df.isna().sum(axis=1) > 3
+    
+    broken_rows = df.index[broken_date | missing_weekrange | too_many_missing]
+    
+    # Fix broken dates; fixes are collected and written back in bulk
+    date_fix_pos = np.flatnonzero(broken_date.to_numpy())
+    if len(date_fix_pos):
+        # Extract every row's year once, then each broken row only slices its neighbours
+        dates = df['Date']
+        years = np.array(dates.astype(str).str.extract(f"({YEAR_RE.pattern})", expand=False), dtype=object)
+        date_fix_val = []
+        for pos in date_fix_pos:
+            start = max(0, pos - YEAR_SEARCH_RANGE)
+            nearby_years = np.delete(years[start:pos + YEAR_SEARCH_RANGE + 1], pos - start)
+            fixed_date = fix_broken_date(str(dates.iat[pos]).strip(), nearby_years)
+            date_fix_val.append(fixed_date)
+            
+            # Later broken rows see the year just imputed, so it carries through long year-less runs
+            year_match = YEAR_RE.search(fixed_date)
+            if year_match:
+                years[pos] = year_match.group(0)
+        df.loc[df.index[date_fix_pos], 'Date'] = np.asarray(date_fix_val, dtype=object)
+    
+    # Fix missing WeekRange in one pass, from the repaired dates
+    if missing_weekrange.any():
+        if 'Date' in cols_set:
+            df.loc[missing_weekrange, weekrange_col] = generate_weekrange_series(df.loc[missing_weekrange, 'Date'])
+        else:
+            df.loc[missing_weekrange, weekrange_col] = ''
     
-    if broken_rows:
+    if len(broken_rows):
         print(f"🔧 Fixed {len(broken_rows)} broken rows")
     
     return df
 
+def broken_date_mask(dates):
+    """Vectorized is_broken_date over a whole Date column"""
+    dates = dates.astype(str).str.strip()
+    return (dates == '') | ~dates.str.contains(YEAR_RE) | dates.str.match(BROKEN_DATE_RE)
+
 def is_broken_date(date_str):
     """Check if date string is broken (missing year)"""
-    if pd.isna(date_str) or date_str == '':
+    if pd.isna(date_str):
         return True
     
-    # Check for patterns that indicate broken dates
-    broken_patterns = [
-        r'^\d{1,2}\s+\w+,?\s*\w*day\s*$',
-        r'^\w*day,?\s*\d{1,2}\s+\w+\s*$',
-        r'^\d{1,2}\s+\w+\s*$',
-        r'^\w+\s+\d{1,2}\s*$'
-    ]
-    
-    for pattern in broken_patterns:
-        if re.match(pattern, str(date_str).strip(), re.IGNORECASE):
-            return True
+    date_str = str(date_str).strip()
+    if not date_str:
+        return True
     
     # Check if no 4-digit year is present
-    if not re.search(r'\b\d{4}\b', str(date_str)):
+    if not YEAR_RE.search(date_str):
         return True
-        
-    return False
-
-def fix_broken_date(df, broken_idx):
-    """Fix a broken date by finding nearby complete dates and imputing the year"""
-    broken_date = str(df.loc[broken_idx, 'Date']).strip()
     
+    # Check for patterns that indicate broken dates
+    return bool(BROKEN_DATE_RE.match(date_str))
+
+def fix_broken_date(broken_date, nearby_years):
+    """Fix a broken date by imputing the most common year among nearby complete dates"""
     # Extract month and day from broken date
     month_day = extract_month_day_from_broken_date(broken_date)
     if not month_day:
         return broken_date
     
-    # Search for nearby complete dates to get the year
-    search_range = 20
-    start_idx = max(0, broken_idx - search_range)
-    end_idx = min(len(df), broken_idx + search_range + 1)
-    
-    nearby_years = []
+    # Rows without a year come through as NaN
+    year_counts = Counter(int(year) for year in nearby_years if isinstance(year, str))
     
-    for i in range(start_idx, end_idx):
-        if i == broken_idx:
-            continue
-        
-        nearby_date = str(df.loc[i, 'Date']).strip()
-        
-        # Extract year from nearby complete dates
-        year_match = re.search(r'\b(\d{4})\b', nearby_date)
-        if year_match:
-            year = int(year_match.group(1))
-            nearby_years.append(year)
-    
-    if nearby_years:
+    if year_counts:
         # Use the most common year
-        most_common_year = max(set(nearby_years), key=nearby_years.count)
+        most_common_year = year_counts.most_common(1)[0][0]
         fixed_date = f"{month_day} {most_common_year}"
         return fixed_date
     
@@ -198,17 +278,12 @@ def fix_broken_date(df, broken_idx):
 def extract_month_day_from_broken_date(broken_date):
     """Extract month and day from broken date string"""
     # Remove weekday names and extra commas
-    cleaned = re.sub(r'\b(monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b,?\s*', '', broken_date, flags=re.IGNORECASE)
+    cleaned = WEEKDAY_RE.sub('', broken_date)
     cleaned = cleaned.strip(' ,')
     
     # Try different patterns to extract month and day
-    patterns = [
-        r'(\d{1,2})\s+(\w+)',
-        r'(\w+)\s+(\d{1,2})'
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, cleaned)
+    for pattern in MONTH_DAY_PATTERNS:
+        match = pattern.search(cleaned)
         if match:
             if match.group(1).isdigit():
                 day, month = match.group(1), match.group(2)
@@ -221,29 +296,45 @@ def extract_month_day_from_broken_date(broken_date):
     
     return None
 
+def parse_date_string(date_str):
+    """Parse one date string with a single regex match; strptime only as a last resort"""
+    match = DATE_PARSE_RE.match(date_str)
+    if match:
+        try:
+            if match['iso']:
+                return datetime.fromisoformat(match['iso'])
+            if match['d']:
+                month = MONTHS.get(match['m'].lower())
+                if month:
+                    return datetime(int(match['y']), month, int(match['d']))
+            elif match['m2']:
+                month = MONTHS.get(match['m2'].lower())
+                if month:
+                    return datetime(int(match['y2']), month, int(match['d2']))
+            else:
+                # Day-first, then month-first
+                a, b, year = int(match['a']), int(match['b']), int(match['y3'])
+                try:
+                    return datetime(year, b, a)
+                except ValueError:
+                    return datetime(year, a, b)
+        except ValueError:
+            pass
+    
+    # Fallback: try different date formats
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str, fmt)
+        except ValueError:
+            continue
+    
+    return None
+
 def generate_weekrange_from_date(date_str):
     """Generate WeekRange from a date string"""
     try:
         # Try to parse the date
-        parsed_date = None
-        
-        # Try different date formats
-        date_formats = [
-            '%d %B %Y',
-            '%d %b %Y',
-            '%B %d %Y',
-            '%b %d %Y',
-            '%Y-%m-%d',
-            '%d/%m/%Y',
-            '%m/%d/%Y'
-        ]
-        
-        for fmt in date_formats:
-            try:
-                parsed_date = datetime.strptime(str(date_str).strip(), fmt)
-                break
-            except ValueError:
-                continue
+        parsed_date = parse_date_string(str(date_str).strip())
         
         if parsed_date:
             # Calculate week range (Monday to Sunday)
@@ -264,76 +355,118 @@ def generate_weekrange_from_date(date_str):
     
     return ""
 
+def parse_date_series(date_strs: pd.Series) -> pd.Series:
+    """Parse a column of date strings in bulk, one strict pass per DATE_FORMATS entry"""
+    # Explicit formats only: format='mixed' hands every element to dateutil, which
+    # also accepts year-less strings like "October" (as year 1 on pandas 3)
+    parsed = pd.Series(pd.NaT, index=date_strs.index, dtype='datetime64[ns]')
+    rest = pd.Series(True, index=date_strs.index)
+    for fmt in DATE_FORMATS:
+        parsed[rest] = pd.to_datetime(date_strs[rest], format=fmt, errors='coerce')
+        rest = parsed.isna()
+        if not rest.any():
+            break
+    return parsed
+
+def generate_weekrange_series(dates: pd.Series) -> pd.Series:
+    """Vectorized generate_weekrange_from_date for a whole Date column"""
+    date_strs = dates.astype(str).str.strip()
+    parsed = parse_date_series(date_strs)
+    
+    # Calculate week range (Monday to Sunday)
+    week_start = parsed - pd.to_timedelta(parsed.dt.weekday, unit='D')
+    week_end = week_start + pd.Timedelta(days=6)
+    
+    # Format: "5 - 11 Oct, 2020" within a month, "28 Sep - 04 Oct, 2020" across months
+    same_month = (
+        week_start.dt.day.astype('Int64').astype(str) + ' - '
+        + week_end.dt.day.astype('Int64').astype(str) + ' '
+        + week_end.dt.strftime('%b, %Y')
+    )
+    cross_month = week_start.dt.strftime('%d %b') + ' - ' + week_end.dt.strftime('%d %b, %Y')
+    week_ranges = pd.Series(
+        np.where(week_start.dt.month == week_end.dt.month, same_month, cross_month),
+        index=dates.index, dtype=object
+    )
+    
+    # Unparsed dates: scalar format ladder, which returns "" when nothing fits
+    unparsed = parsed.isna()
+    if unparsed.any():
+        week_ranges[unparsed] = date_strs[unparsed].map(generate_weekrange_from_date)
+    
+    return week_ranges
+
 def fix_csv_structure(csv_path):
     """Fix CSV structure and detect broken rows by parsing raw lines"""
-    # Read the raw file to detect structure issues
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-    
-    # Check if we have the right number of columns
-    if len(lines) < 2:
-        return pd.read_csv(csv_path)
     
-    header_line = lines[0].strip()
-    expected_cols = len(EXPECTED_COLUMNS)
+    # Locate line boundaries and count commas per line with numpy instead of a Python loop
+    data = csv_path.read_bytes()
+    arr = np.frombuffer(data, dtype=np.uint8)
+    newlines = np.flatnonzero(arr == ord('\n'))
+    starts = np.r_[0, newlines + 1]
+    ends = np.r_[newlines, len(arr)]
+    if starts[-1] == len(arr):  # Nothing after the final newline
+        starts, ends = starts[:-1], ends[:-1]
     
-    fixed_lines = []
+    line_count = len(starts)
     broken_line_count = 0
     
-    for i, line in enumerate(lines):
-        line = line.strip()
+    # Check if we have the right number of columns
+    if line_count < 2:
+        return read_csv_as_text(csv_path)
+    
+    # Running comma total, so each line's count is a difference of two entries
+    comma_total = np.r_[0, np.cumsum(arr == ord(','))]
+    comma_counts = comma_total[ends] - comma_total[starts]
+    
+    # Lines with surrounding whitespace still need strip(); a trailing \r alone is harmless
+    whitespace = np.frombuffer(b' \t\r\x0b\x0c', dtype=np.uint8)
+    last_byte = np.clip(ends - 1, 0, None)
+    last_byte -= arr[last_byte] == ord('\r')
+    needs_fixing = (
+        (comma_counts != EXPECTED_COL_COUNT - 1)
+        | np.isin(arr[np.minimum(starts, len(arr) - 1)], whitespace)
+        | np.isin(arr[np.clip(last_byte, 0, None)], whitespace)
+    )
+    
+    # Copy well-formed runs of lines verbatim; only the flagged lines go through Python
+    chunks = []
+    pos = 0
+    for i in np.flatnonzero(needs_fixing):
+        chunks.append(data[pos:starts[i]])
+        pos = ends[i] + 1
+        line = data[starts[i]:ends[i]].decode('utf-8').strip()
         if not line:
             continue
         
         # Count commas to estimate columns
-        comma_count = line.count(',')
-        estimated_cols = comma_count + 1
+        estimated_cols = line.count(',') + 1
         
         if i == 0:  # Header
-            if estimated_cols != expected_cols:
+            if estimated_cols < EXPECTED_COL_COUNT:
                 # Fix header if needed
-                if estimated_cols < expected_cols:
-                    missing_cols = expected_cols - estimated_cols
-                    line += ',' + ','.join([''] * missing_cols)
-            fixed_lines.append(line)
+                line += ',' * (EXPECTED_COL_COUNT - estimated_cols)
         
-        else:  # Data rows
-            if estimated_cols < expected_cols:
-                broken_line_count += 1
-                # This is likely a broken row missing WeekRange
-                missing_cols = expected_cols - estimated_cols
-                fixed_line = line + ',' + ','.join([''] * missing_cols)
-                fixed_lines.append(fixed_line)
-            
-            elif estimated_cols > expected_cols:
-                broken_line_count += 1
-                # Too many columns, try to merge some
-                parts = line.split(',')
-                if len(parts) > expected_cols:
-                    # Keep first expected_cols-1 parts, merge the rest as the last column
-                    fixed_parts = parts[:expected_cols-1]
-                    merged_last = ','.join(parts[expected_cols-1:])
-                    fixed_parts.append(merged_last)
-                    fixed_line = ','.join(fixed_parts)
-                    fixed_lines.append(fixed_line)
-                else:
-                    fixed_lines.append(line)
-            
-            else:
-                fixed_lines.append(line)
-    
-    # Write fixed content to a temporary file and read it
-    temp_file = csv_path.parent / f"temp_{csv_path.name}"
-    with open(temp_file, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(fixed_lines))
+        elif estimated_cols < EXPECTED_COL_COUNT:  # Data rows
+            broken_line_count += 1
+            # This is likely a broken row missing WeekRange
+            line += ',' * (EXPECTED_COL_COUNT - estimated_cols)
+        
+        elif estimated_cols > EXPECTED_COL_COUNT:
+            broken_line_count += 1
+            # Too many columns, try to merge some: keep first EXPECTED_COL_COUNT-1
+            # parts, merge the rest as the last column
+            parts = line.split(',')
+            line = ','.join(parts[:EXPECTED_COL_COUNT-1] + [','.join(parts[EXPECTED_COL_COUNT-1:])])
+        
+        chunks.append((line + '\n').encode('utf-8'))
+    chunks.append(data[pos:])
     
+    # Parse the fixed content straight from memory
     try:
-        df = pd.read_csv(temp_file)
-        temp_file.unlink()
-        return df
+        return read_csv_as_text(b''.join(chunks))
     except Exception:
-        temp_file.unlink()
-        return pd.read_csv(csv_path)
+        return read_csv_as_text(csv_path)
 
 # ==== IMPROVED DECEMBER BUG FIX FUNCTION ====
 def fix_december_week_overlap(df: pd.DataFrame) -> pd.DataFrame:
@@ -344,75 +477,62 @@ def fix_december_week_overlap(df: pd.DataFrame) -> pd.DataFrame:
     # Store examples for output, organized by year
     correction_examples_by_year = {}
     
-    # Iterate through rows and fix dates where needed
-    for idx, row in df.iterrows():
-        try:
-            date_str = str(row['Date']).strip()
-            week_range = str(row['WeekRange']).strip()
-            
-            # Skip rows without proper WeekRange
-            if not week_range or ' - ' not in week_range:
-                continue
-            
-            # Parse the WeekRange to get the start and end parts
-            week_parts = week_range.split(' - ')
-            if len(week_parts) != 2:
-                continue
-            
-            start_part = week_parts[0].strip()
-            end_part = week_parts[1].strip()
-            
-            # Extract years from both parts of WeekRange
-            start_year_match = re.search(r',\s*(\d{4})$', start_part)
-            end_year_match = re.search(r',\s*(\d{4})$', end_part)
-            
-            if not start_year_match or not end_year_match:
-                continue
-            
-            start_year = int(start_year_match.group(1))
-            end_year = int(end_year_match.group(1))
-            
-            # Check if this is a cross-year week (December to January)
-            is_cross_year_week = (end_year > start_year)
-            
-            if is_cross_year_week:
-                # Parse the current date
-                current_date = pd.to_datetime(date_str, dayfirst=True, errors='coerce')
-                if pd.isna(current_date):
-                    continue
-                
-                # Extract month and day from current date
-                current_month = current_date.month
-                current_day = current_date.day
-                current_year = current_date.year
-                
-                # Only fix December dates that have the wrong year
-                if current_month == 12 and current_year == end_year:
-                    # This is a December date that incorrectly has the next year
-                    # Correct it to use the start year from WeekRange
-                    corrected_date = current_date.replace(year=start_year)
-                    corrected_date_str = corrected_date.strftime('%d %B %Y')
-                    
-                    # Update the DataFrame
-                    df.at[idx, 'Date'] = corrected_date_str
-                    
-                    # Store example for output (limit to 5 per year)
-                    year_key = start_year
-                    if year_key not in correction_examples_by_year:
-                        correction_examples_by_year[year_key] = []
-                    
-                    if len(correction_examples_by_year[year_key]) < 5:
-                        correction_examples_by_year[year_key].append({
-                            'index': idx,
-                            'original_date': date_str,
-                            'corrected_date': corrected_date_str,
-                            'week_range': week_range,
-                            'currency': row.get('Currency', 'N/A'),
-                            'event': row.get('Event', 'N/A')[:50]  # Truncate long event names
-                        })
-        
-        except Exception:
-            continue
+    date_strs = df['Date'].astype(str).str.strip()
+    week_ranges = df['WeekRange'].astype(str).str.strip()
+    
+    # Parse the WeekRange into start and end parts; only "<start> - <end>" qualifies
+    week_parts = week_ranges.str.split(' - ')
+    has_two_parts = week_parts.str.len() == 2
+    if not has_two_parts.any():
+        return df
+    
+    # Extract years from both parts of WeekRange
+    start_year = pd.to_numeric(week_parts.str[0].str.strip().str.extract(WEEKRANGE_YEAR_RE)[0], errors='coerce')
+    end_year = pd.to_numeric(week_parts.str[1].str.strip().str.extract(WEEKRANGE_YEAR_RE)[0], errors='coerce')
+    
+    # Cross-year weeks (December to January)
+    is_cross_year_week = has_two_parts & (end_year > start_year)
+    
+    # Parse all dates in bulk; only the odd formats left over go through dateutil one by one
+    dates = parse_date_series(date_strs)
+    rest = dates.isna()
+    if rest.any():
+        dates[rest] = pd.to_datetime(date_strs[rest].map(lambda d: pd.to_datetime(d, dayfirst=True, errors='coerce')))
+    
+    # Only fix December dates that have the wrong (next) year
+    mask = is_cross_year_week & (dates.dt.month == 12) & (dates.dt.year == end_year)
+    if not mask.any():
+        return df
+    
+    # Correct them to use the start year from WeekRange; the month is always December,
+    # so the "DD Month YYYY" string is assembled directly instead of built and strftime'd
+    corrected_strs = (
+        dates[mask].dt.day.astype(str).str.zfill(2)
+        + ' December '
+        + start_year[mask].astype(int).astype(str)
+    )
+    
+    # Store examples for output (limit to 5 per year), pulling their columns in bulk
+    corrected_years = start_year[mask].astype(int)
+    sample_years = corrected_years.groupby(corrected_years).head(5)
+    sample_idx = sample_years.index
+    cols_set = set(df.columns)
+    currencies = df.loc[sample_idx, 'Currency'].astype(str) if 'Currency' in cols_set else pd.Series('N/A', index=sample_idx)
+    events = df.loc[sample_idx, 'Event'].astype(str) if 'Event' in cols_set else pd.Series('N/A', index=sample_idx)
+    events = events.str.slice(0, 50)  # Truncate long event names
+    
+    for idx, year_key in sample_years.items():
+        correction_examples_by_year.setdefault(year_key, []).append({
+            'index': idx,
+            'original_date': date_strs[idx],
+            'corrected_date': corrected_strs[idx],
+            'week_range': week_ranges[idx],
+            'currency': currencies[idx],
+            'event': events[idx]
+        })
+    
+    # Update the DataFrame
+    df.loc[mask, 'Date'] = corrected_strs
     
     # Print final output showing December fixes by year
     if correction_examples_by_year:
@@ -456,9 +576,9 @@ def main():
     merged_df.columns = merged_df.columns.str.strip()
     
     # Ensure we have the right columns
-    if len(merged_df.columns) != len(EXPECTED_COLUMNS):
-        if len(merged_df.columns) < len(EXPECTED_COLUMNS):
-            for i in range(len(merged_df.columns), len(EXPECTED_COLUMNS)):
+    if len(merged_df.columns) != EXPECTED_COL_COUNT:
+        if len(merged_df.columns) < EXPECTED_COL_COUNT:
+            for i in range(len(merged_df.columns), EXPECTED_COL_COUNT):
                 merged_df[EXPECTED_COLUMNS[i]] = ''
         merged_df.columns = EXPECTED_COLUMNS[:len(merged_df.columns)]
     
@@ -479,54 +599,70 @@ def main():
     monthly_csv_files = sorted([f for folder in monthly_batches_root.glob("* Batch") for f in folder.glob("*.csv")])
     latest_monthly_csv = None
 
+    # Track row hashes so each batch is deduplicated before it is ever concatenated
+    seen_hashes = set(pd.util.hash_pandas_object(merged_df, index=False).tolist())
+    merged_parts = [merged_df]
+
     for csv_file in monthly_csv_files:
         print(f"📁 Processing monthly batch: {csv_file.name}")
         
-        # Fix CSV structure first
-        batch_df = fix_csv_structure(csv_file)
-        batch_df.columns = batch_df.columns.str.strip()
-        
-        # Ensure columns match
-        if len(batch_df.columns) != len(EXPECTED_COLUMNS):
-            if len(batch_df.columns) < len(EXPECTED_COLUMNS):
-                for i in range(len(batch_df.columns), len(EXPECTED_COLUMNS)):
-                    batch_df[EXPECTED_COLUMNS[i]] = ''
-            batch_df.columns = EXPECTED_COLUMNS[:len(batch_df.columns)]
+        # Reuse the processed batch from a previous run if the CSV hasn't changed
+        cache_file = cache_folder / f"{csv_file.parent.name}__{csv_file.stem}.parquet"
+        batch_df = load_cached_batch(csv_file, cache_file)
         
-        # Optimize memory usage
-        batch_df = optimize_dataframe(batch_df)
-        
-        # Detect and fix broken rows in monthly batch
-        batch_df = detect_and_fix_broken_rows(batch_df)
+        if batch_df is None:
+            # Fix CSV structure first
+            batch_df = fix_csv_structure(csv_file)
+            batch_df.columns = batch_df.columns.str.strip()
+            
+            # Ensure columns match
+            if len(batch_df.columns) != EXPECTED_COL_COUNT:
+                if len(batch_df.columns) < EXPECTED_COL_COUNT:
+                    for i in range(len(batch_df.columns), EXPECTED_COL_COUNT):
+                        batch_df[EXPECTED_COLUMNS[i]] = ''
+                batch_df.columns = EXPECTED_COLUMNS[:len(batch_df.columns)]
+            
+            # Optimize memory usage
+            batch_df = optimize_dataframe(batch_df)
+            
+            # Detect and fix broken rows in monthly batch
+            batch_df = detect_and_fix_broken_rows(batch_df)
+            
+            save_cached_batch(batch_df, cache_file)
         
         # Align columns with merged_df
         batch_df = batch_df.reindex(columns=merged_df.columns, fill_value='')
 
-        # Merge without duplicates
-        combined = pd.concat([merged_df, batch_df], ignore_index=True)
-        new_rows_mask = ~combined.duplicated(keep='first')
-        new_rows_df = combined[new_rows_mask].iloc[len(merged_df):]
+        # Keep only rows not seen in the main batch or any earlier monthly batch
+        row_hashes = pd.util.hash_pandas_object(batch_df, index=False)
+        new_rows_mask = ~row_hashes.isin(seen_hashes) & ~row_hashes.duplicated()
+        new_rows_df = batch_df[new_rows_mask]
 
         if len(new_rows_df) > 0:
             print(f"✅ {len(new_rows_df)} new rows merged from {csv_file.name}")
-            merged_df = pd.concat([merged_df, new_rows_df], ignore_index=True)
-            
-            # Force garbage collection after large operations
-            gc.collect()
+            seen_hashes.update(row_hashes[new_rows_mask].tolist())
+            merged_parts.append(new_rows_df)
         else:
             print(f"⚠️ No new rows to merge from {csv_file.name}")
 
         latest_monthly_csv = csv_file
+        
+        # Release this batch before the next one is loaded; only its new rows are kept
+        del batch_df, row_hashes, new_rows_mask, new_rows_df
+
+    merged_df = pd.concat(unify_categories(merged_parts), ignore_index=True)
+    del merged_parts, seen_hashes
 
     # ==== APPLY DECEMBER BUG FIX ====
     print("🗓️ Applying December week overlap fix...")
-    if 'Date' in merged_df.columns and 'WeekRange' in merged_df.columns:
+    cols_set = set(merged_df.columns)
+    if 'Date' in cols_set and 'WeekRange' in cols_set:
         merged_df = fix_december_week_overlap(merged_df)
     else:
         print("❌ Cannot apply December fix: 'Date' or 'WeekRange' column missing")
 
-    # ==== FINAL CHECK FOR ANY REMAINING BROKEN ROWS ====
-    merged_df = detect_and_fix_broken_rows(merged_df)
+    # No final broken-row pass: every batch was already repaired before merging, and the
+    # December fix only writes complete "DD Month YYYY" dates into rows with a full WeekRange
 
     # ==== CONSTRUCT MERGED FILENAME ====
     main_stem = main_csv_path.stem
@@ -539,7 +675,7 @@ def main():
         merged_filename = main_stem
 
     # Remove any illegal Windows filename characters
-    merged_filename = re.sub(r'[<>:"/\\|?*]', '', merged_filename)
+    merged_filename = ILLEGAL_FNAME_RE.sub('', merged_filename)
 
     # Save CSV
     output_file = output_folder / f"{merged_filename}.csv"
@@ -551,8 +687,9 @@ def main():
     print(f"Total rows in final dataset: {len(merged_df)}")
     
     # Check for any remaining issues
-    broken_dates = merged_df['Date'].apply(lambda x: is_broken_date(str(x))).sum()
-    missing_weekranges = merged_df['WeekRange'].isna().sum() + (merged_df['WeekRange'] == '').sum()
+    week_ranges = merged_df['WeekRange']
+    broken_dates = broken_date_mask(merged_df['Date']).sum()
+    missing_weekranges = (week_ranges.isna() | (week_ranges.astype(str) == '')).sum()
     
     print(f"Remaining broken dates: {broken_dates}")
     print(f"Remaining missing WeekRanges: {missing_weekranges}")